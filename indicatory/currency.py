@@ -2,6 +2,12 @@ import indicatory.names as names
 
 from polars import DataFrame, col
 
+from indicatory.frames import ROW_INDEX_COL
+
+# Temporary columns holding the currency prices while they're joined onto the asset data
+CURRENCY_OPEN_COL = "Currency Open"
+CURRENCY_CLOSE_COL = "Currency Close"
+
 
 def relative_currency_strength(
     dataframe: DataFrame, currency_data: DataFrame
@@ -10,25 +16,34 @@ def relative_currency_strength(
     Relative Currency Strength (RCS) compares the price of an asset (open and close) to the
     strength of the currency in which it is traded.
 
+    Each asset row is matched with the most recent currency row on or before its date. Neither
+    dataframe has to be sorted by "Date"; the result keeps the asset rows in their original order.
+
     Args:
         dataframe: OHLC data for an asset (stock, commodity etc.).
         currency_data: OHLC data for the currency in which the asset is traded (e.g. USD for US stocks).
 
     Returns:
-        Original dataframe with two additional columns "RSC Open" and "RSC Close", containing the RCS
+        Original dataframe with two additional columns "RCS Open" and "RCS Close", containing the RCS
         values calculated for the opening and closing prices of the asset, respectively.
     """
-    start_date = dataframe[names.DATE].min()
-    end_date = dataframe[names.DATE].max()
-    # ensure that dataframe["Date"] and currency_data["Date"] cover the same time frame
-    currency_data_slice = currency_data.filter(
-        col.Date.is_between(start_date, end_date)
-    )
-    return dataframe.with_columns(
-        (dataframe[names.OPEN] / currency_data_slice[names.OPEN]).alias(
-            names.rcs_open()
-        ),
-        (dataframe[names.CLOSE] / currency_data_slice[names.CLOSE]).alias(
-            names.rcs_close()
-        ),
+    # Align currency and asset data by date rather than by position, so that frames with
+    # different lengths or gaps (weekends, holidays) are still matched correctly
+    currency_prices = currency_data.select(
+        col(names.DATE),
+        col(names.OPEN).alias(CURRENCY_OPEN_COL),
+        col(names.CLOSE).alias(CURRENCY_CLOSE_COL),
+    ).sort(names.DATE)
+    # The asof join needs both sides sorted by date (sorting data that's already sorted is cheap).
+    # The row index restores the asset rows' original order afterwards.
+    return (
+        dataframe.with_row_index(ROW_INDEX_COL)
+        .sort(names.DATE)
+        .join_asof(currency_prices, on=names.DATE, strategy="backward")
+        .sort(ROW_INDEX_COL)
+        .with_columns(
+            (col(names.OPEN) / col(CURRENCY_OPEN_COL)).alias(names.RCS_OPEN),
+            (col(names.CLOSE) / col(CURRENCY_CLOSE_COL)).alias(names.RCS_CLOSE),
+        )
+        .drop(ROW_INDEX_COL, CURRENCY_OPEN_COL, CURRENCY_CLOSE_COL)
     )
@@ -2,12 +2,31 @@ import numpy
 
 import indicatory.names as names
 
-from polars import DataFrame, Series, col
+from functools import reduce
+from operator import add
+from polars import Expr, Series, col, when
+from polars.type_aliases import PolarsDataType
+
+from indicatory.frames import (
+    ROW_INDEX_COL,
+    Frame,
+    typed_col,
+    with_columns_fused,
+    with_columns_indexed,
+)
+
+# Largest window for which the rolling mean absolute deviation is calculated via shifts (see
+# ``rolling_mean_absolute_deviation``). Every shift adds to the expression tree, which gets slow
+# (and eventually too deep for polars) for large windows.
+MAX_SHIFTED_WINDOW_SIZE = 32
 
 
 def standard_deviation(
-    dataframe: DataFrame, window_size: int = 10, column_name: str = names.CLOSE
-) -> DataFrame:
+    dataframe: Frame,
+    window_size: int = 10,
+    column_name: str = names.CLOSE,
+    dtype: PolarsDataType | None = None,
+) -> Frame:
     """
     Calculates the rolling standard deviation of a specified column in a ``polars.DataFrame``.
 
@@ -16,11 +35,13 @@ def standard_deviation(
     By default, the function uses a window size of 10 and the 'Close' column.
 
     Args:
-        dataframe: A Polars DataFrame containing numerical data.
+        dataframe: A Polars DataFrame or LazyFrame containing numerical data.
         window_size: An integer specifying the size of the rolling window to use for
                      calculating standard deviation. Defaults to 10.
         column_name: A string specifying the name of the column in the DataFrame to
                      calculate standard deviation on. Defaults to 'Close'.
+        dtype: Optional data type (e.g. ``polars.Float32``) to cast the column to before
+               calculating. Trades precision for speed; defaults to ``None`` (no cast).
 
     Returns:
         A Polars DataFrame with an additional column containing the rolling standard deviation
@@ -30,15 +51,18 @@ def standard_deviation(
         values.
     """
     return dataframe.with_columns(
-        col(column_name)
+        typed_col(column_name, dtype)
         .rolling_std(window_size=window_size)
         .alias(names.sd(base_column=column_name, window_size=window_size))
     )
 
 
 def variance(
-    dataframe: DataFrame, window_size: int = 10, column_name: str = names.CLOSE
-) -> DataFrame:
+    dataframe: Frame,
+    window_size: int = 10,
+    column_name: str = names.CLOSE,
+    dtype: PolarsDataType | None = None,
+) -> Frame:
     """
     Calculates the rolling variance of a specified column in a Polars DataFrame.
 
@@ -47,11 +71,13 @@ def variance(
     By default, the function uses a window size of 10 and the 'Close' column.
 
     Args:
-        dataframe: A Polars DataFrame containing numerical ("OHLC") data.
+        dataframe: A Polars DataFrame or LazyFrame containing numerical ("OHLC") data.
         window_size: An integer specifying the size of the rolling window to use
                      for calculating variance. Defaults to 10.
         column_name: A string specifying the name of the column in the DataFrame
                      to calculate variance on. Defaults to 'Close'.
+        dtype: Optional data type (e.g. ``polars.Float32``) to cast the column to before
+               calculating. Trades precision for speed; defaults to ``None`` (no cast).
 
     Returns:
         A Polars DataFrame with an additional column containing the rolling variance values for
@@ -60,7 +86,7 @@ def variance(
         data can be found in the specified column, the new column will contain null values.
     """
     return dataframe.with_columns(
-        col(column_name)
+        typed_col(column_name, dtype)
         .rolling_var(window_size=window_size)
         .alias(names.var(base_column=column_name, window_size=window_size))
     )
@@ -81,24 +107,73 @@ def mean_absolute_deviation(s: Series) -> float:
     Returns:
         A float representing the mean absolute deviation of the input series.
     """
-    return (numpy.abs(s - s.mean())).sum() / s.count()
+    # The null count is cached by polars, so only filter when there actually are nulls
+    if s.null_count() > 0:
+        s = s.drop_nulls()
+    # Work on a single (copied) float buffer in-place instead of materializing a new
+    # Series for both `s - mean` and `abs(...)`
+    values = s.to_numpy().astype(numpy.float64, copy=True)
+    values -= values.mean()
+    numpy.abs(values, out=values)
+    return values.sum() / values.size
+
+
+def rolling_mean_absolute_deviation(column_name: str, window_size: int) -> Expr:
+    """
+    Builds the (unaliased) expression calculating the rolling Mean Absolute Deviation of a
+    column, e.g. for combining it with other indicators within one query.
+
+    Args:
+        column_name: The name of the column to calculate the rolling mean absolute deviation on.
+        window_size: An integer representing the size of the rolling window.
+
+    Returns:
+        A polars expression. For windows larger than ``MAX_SHIFTED_WINDOW_SIZE`` it refers to the
+        temporary column ``frames.ROW_INDEX_COL``, so add it to a frame via
+        ``frames.with_columns_indexed``.
+    """
+    price = col(column_name)
+    if window_size <= MAX_SHIFTED_WINDOW_SIZE:
+        # Every value in a window has to be compared against the mean of *that* window, so we
+        # line up the window's values via shifts instead of calling back into Python per window.
+        window_mean = price.rolling_mean(window_size=window_size)
+        absolute_deviations = (
+            (price.shift(offset) - window_mean).abs() for offset in range(window_size)
+        )
+        return reduce(add, absolute_deviations) / window_size
+    # Rolling groups over the row index aggregate each window natively instead. They include
+    # incomplete windows at the start, which are set to null like those of the other rolling functions.
+    deviations = (
+        (price - price.mean())
+        .abs()
+        .mean()
+        .rolling(index_column=ROW_INDEX_COL, period=f"{window_size}i")
+    )
+    return when(col(ROW_INDEX_COL) >= window_size - 1).then(deviations)
+
+
+def _with_columns_for_window(frame: Frame, window_size: int, *exprs: Expr) -> Frame:
+    # Only rolling mean absolute deviations over large windows need the (temporary) row index
+    if window_size > MAX_SHIFTED_WINDOW_SIZE:
+        return with_columns_indexed(frame, *exprs)
+    return with_columns_fused(frame, *exprs)
 
 
 def average_absolute_deviation(
-    dataframe: DataFrame, window_size: int = 10, column_name: str = names.CLOSE
-):
+    dataframe: Frame, window_size: int = 10, column_name: str = names.CLOSE
+) -> Frame:
     """
     Calculates the Average Absolute Deviation as the rolling Mean Absolute Deviation of a
     specified column in a Polars DataFrame.
 
     The rolling mean absolute deviation is calculated over a user-specified window size
-    using `indicatory.deviations.mean_absolute_deviation`.
+    as a native polars expression (i.e. without calling back into Python for each window).
 
     For more information, see `Wikipedia:AAD <https://en.wikipedia.org/wiki/Average_absolute_deviation>`_
 
 
     Args:
-        dataframe: A Polars DataFrame containing numerical ("OHLC") data.
+        dataframe: A Polars DataFrame or LazyFrame containing numerical ("OHLC") data.
         window_size: An integer representing the size of the rolling window. Defaults to 10.
         column_name: A string representing the name of the column to calculate the rolling mean absolute
                      deviation on. Defaults to 'Close'.
@@ -110,18 +185,18 @@ def average_absolute_deviation(
         no valid numerical data can be found in the specified column, the new column will
         contain null values.
     """
-    return dataframe.with_columns(
-        (
-            col(column_name).rolling_map(
-                mean_absolute_deviation, window_size=window_size
-            )
-        ).alias(names.aad(base_column=column_name, window_size=window_size))
+    return _with_columns_for_window(
+        dataframe,
+        window_size,
+        rolling_mean_absolute_deviation(
+            column_name=column_name, window_size=window_size
+        ).alias(names.aad(base_column=column_name, window_size=window_size)),
     )
 
 
 def standard_deviation_bands(
-    dataframe: DataFrame, window_size: int = 10, column_name: str = names.CLOSE
-) -> DataFrame:
+    dataframe: Frame, window_size: int = 10, column_name: str = names.CLOSE
+) -> Frame:
     """
     Calculates the rolling standard deviation of a specified column in a Polars DataFrame
     and uses it to calculate lower and upper bands. The lower band is calculated as the
@@ -129,7 +204,7 @@ def standard_deviation_bands(
     the input column values plus the standard deviation.
 
     Args:
-        dataframe: A Polars DataFrame containing numerical ("OHLC") data.
+        dataframe: A Polars DataFrame or LazyFrame containing numerical ("OHLC") data.
         window_size: An integer representing the size of the rolling window. Defaults to 10.
         column_name: A string representing the name of the column to calculate the rolling mean absolute
                      deviation on. Defaults to 'Close'.
@@ -141,23 +216,25 @@ def standard_deviation_bands(
         window size as arguments. If no valid numerical data can be found in the specified column,
         the new columns will contain null values.
     """
-    dataframe_with_sd = standard_deviation(
-        dataframe=dataframe, window_size=window_size, column_name=column_name
-    )
-    sd_column = names.sd(base_column=column_name, window_size=window_size)
-    return dataframe_with_sd.with_columns(
-        (col(column_name) - col(sd_column)).alias(
+    # Polars' common subexpression elimination computes the rolling standard deviation only
+    # once for all three columns. The bands are calculated with the column's own data type;
+    # see ``standard_deviation(dtype=...)`` for trading precision (e.g. Float32) for speed.
+    sd = col(column_name).rolling_std(window_size=window_size)
+    return with_columns_fused(
+        dataframe,
+        sd.alias(names.sd(base_column=column_name, window_size=window_size)),
+        (col(column_name) - sd).alias(
             names.sd_lower(base_column=column_name, window_size=window_size)
         ),
-        (col(column_name) + col(sd_column)).alias(
+        (col(column_name) + sd).alias(
             names.sd_upper(base_column=column_name, window_size=window_size)
         ),
     )
 
 
 def average_absolute_deviation_bands(
-    dataframe: DataFrame, window_size: int = 10, column_name: str = names.CLOSE
-):
+    dataframe: Frame, window_size: int = 10, column_name: str = names.CLOSE
+) -> Frame:
     """
     Calculates the rolling mean absolute deviation of a
     specified column in a Polars DataFrame and uses it to calculate lower and upper bands.
@@ -167,7 +244,7 @@ def average_absolute_deviation_bands(
 
 
     Args:
-        dataframe: A Polars DataFrame containing numerical ("OHLC") data.
+        dataframe: A Polars DataFrame or LazyFrame containing numerical ("OHLC") data.
         window_size: An integer representing the size of the rolling window. Defaults to 10.
         column_name: A string representing the name of the column to calculate the rolling mean absolute
                      deviation on. Defaults to 'Close'.
@@ -179,15 +256,17 @@ def average_absolute_deviation_bands(
         which take the base column name and window size as arguments. If no valid numerical
         data can be found in the specified column, the new columns will contain null values.
     """
-    dataframe_with_sd = average_absolute_deviation(
-        dataframe=dataframe, window_size=window_size, column_name=column_name
+    aad = rolling_mean_absolute_deviation(
+        column_name=column_name, window_size=window_size
     )
-    aad_col = names.aad(base_column=column_name, window_size=window_size)
-    return dataframe_with_sd.with_columns(
-        (col(column_name) - col(aad_col)).alias(
+    return _with_columns_for_window(
+        dataframe,
+        window_size,
+        aad.alias(names.aad(base_column=column_name, window_size=window_size)),
+        (col(column_name) - aad).alias(
             names.aad_lower(base_column=column_name, window_size=window_size)
         ),
-        (col(column_name) + col(aad_col)).alias(
+        (col(column_name) + aad).alias(
             names.aad_upper(base_column=column_name, window_size=window_size)
         ),
     )
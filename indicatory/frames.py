@@ -0,0 +1,82 @@
+from typing import TypeVar
+
+from polars import DataFrame, Expr, LazyFrame, col
+from polars.type_aliases import PolarsDataType
+
+# Indicators accept both eager and lazy frames and return the same kind of frame they were
+# given. Lazy frames allow chaining several indicators into a single (optimized) query.
+Frame = TypeVar("Frame", DataFrame, LazyFrame)
+
+# Temporary column holding each row's index, e.g. for rolling groups (see ``with_columns_indexed``).
+# Named so that it doesn't collide with the columns of the frames indicators are called with.
+ROW_INDEX_COL = "__indicatory_row_index"
+
+
+def with_columns_fused(frame: Frame, *exprs: Expr) -> Frame:
+    """
+    Adds the given expressions as new columns to a (lazy or eager) frame within a single
+    lazy query.
+
+    Eager ``with_columns`` calls skip polars' query optimizations, so shared subexpressions
+    (e.g. a rolling mean used by several columns) would be calculated multiple times. Running
+    them as one lazy query lets polars calculate them only once.
+
+    Args:
+        frame: A polars DataFrame or LazyFrame.
+        exprs: The (aliased) expressions to add as columns.
+
+    Returns:
+        A DataFrame if ``frame`` is a DataFrame, otherwise a LazyFrame, with the new columns added.
+    """
+    return collect_like(frame, frame.lazy().with_columns(*exprs))
+
+
+def with_columns_indexed(frame: Frame, *exprs: Expr) -> Frame:
+    """
+    Same as ``with_columns_fused``, but the expressions may refer to a temporary column
+    ``ROW_INDEX_COL`` containing each row's index (starting at zero). The column is dropped
+    again before the result is returned.
+
+    Args:
+        frame: A polars DataFrame or LazyFrame.
+        exprs: The (aliased) expressions to add as columns.
+
+    Returns:
+        A DataFrame if ``frame`` is a DataFrame, otherwise a LazyFrame, with the new columns added.
+    """
+    return collect_like(
+        frame,
+        frame.lazy()
+        .with_row_index(ROW_INDEX_COL)
+        .with_columns(*exprs)
+        .drop(ROW_INDEX_COL),
+    )
+
+
+def collect_like(frame: Frame, result: LazyFrame) -> Frame:
+    """
+    Args:
+        frame: The (lazy or eager) frame an indicator was called with.
+        result: The lazy query calculating the indicator.
+
+    Returns:
+        ``result`` collected into a DataFrame if ``frame`` is a DataFrame, otherwise ``result`` as is.
+    """
+    return result.collect() if isinstance(frame, DataFrame) else result
+
+
+def typed_col(column_name: str, dtype: PolarsDataType | None = None) -> Expr:
+    """
+    Selects a column, optionally casting it to another data type first.
+
+    Casting ``Float64`` price data to ``Float32`` halves the amount of memory that rolling
+    calculations have to go through, at the cost of precision (roughly 7 significant digits).
+
+    Args:
+        column_name: Name of the column to select.
+        dtype: Data type to cast the column to. If ``None`` (default), the column is used as is.
+
+    Returns:
+        An expression selecting the (cast) column.
+    """
+    return col(column_name) if dtype is None else col(column_name).cast(dtype)
@@ -1,40 +1,49 @@
 import indicatory.names as names
 
+from functools import lru_cache
 from itertools import product
-from polars import DataFrame, Series, col
+from polars import DataFrame, Expr, Series, col, concat
+from polars.type_aliases import PolarsDataType
+
+from indicatory.frames import Frame, typed_col, with_columns_fused
 
 
 def simple_moving_average(
-    dataframe: DataFrame, column_name: str = names.CLOSE, window_size: int = 10
-) -> DataFrame:
+    dataframe: Frame,
+    column_name: str = names.CLOSE,
+    window_size: int = 10,
+    dtype: PolarsDataType | None = None,
+) -> Frame:
     """
     Calculates the simple moving average (SMA) for a given DataFrame column and window size.
 
     Args:
-        dataframe (DataFrame): The input DataFrame containing financial data.
+        dataframe (DataFrame | LazyFrame): The input DataFrame (or LazyFrame) containing financial data.
         column_name (str, optional): The name of the column to calculate the SMA on. Default is "Close".
         window_size (int, optional): The number of periods to use for calculating the SMA. Default is 10.
+        dtype (PolarsDataType, optional): Data type (e.g. ``polars.Float32``) to cast the column to before
+                                          calculating. Trades precision for speed; default is ``None`` (no cast).
 
     Returns:
         DataFrame: A new DataFrame with an additional column containing the calculated Simple Moving Average.
     """
     return dataframe.with_columns(
-        (col(column_name).rolling_mean(window_size=window_size)).alias(
+        (typed_col(column_name, dtype).rolling_mean(window_size=window_size)).alias(
             names.sma(column_name=column_name, window_size=window_size)
         )
     )
 
 
 def simple_moving_averages(
-    dataframe: DataFrame,
+    dataframe: Frame,
     window_sizes: list[int] | None = None,
     column_names: list[str] | None = None,
-) -> DataFrame:
+) -> Frame:
     """
     Calculates simple moving averages for multiple columns and window sizes on a given DataFrame.
 
     Args:
-        dataframe: The input DataFrame containing financial data.
+        dataframe: The input DataFrame (or LazyFrame) containing financial data.
         window_sizes: A list of different window sizes to use for calculating the SMAs.
                       If ``None``, default is ``[10]``.
         column_names: A list of columns names on which to calculate the SMAs.
@@ -49,7 +58,10 @@ def simple_moving_averages(
         window_sizes = [10]
     if not column_names:
         column_names = [names.CLOSE]
-    combinations = product(column_names, window_sizes)
+    # Drop duplicate columns / window sizes (while keeping their order) so that every rolling
+    # mean is only calculated once. Since ``product`` varies the window sizes fastest, all
+    # rolling means for the same column end up next to each other.
+    combinations = product(dict.fromkeys(column_names), dict.fromkeys(window_sizes))
     return dataframe.with_columns(
         *(
             (col(column_name).rolling_mean(window_size=window_size)).alias(
@@ -60,6 +72,78 @@ def simple_moving_averages(
     )
 
 
+class IncrementalSimpleMovingAverage:
+    """
+    Stateful simple moving average (SMA) for data that grows over time, e.g. in backtests
+    where new rows are appended to the same DataFrame on every tick.
+
+    Instead of recalculating the SMA over the whole column each time, only the rows that were
+    added since the last call (plus the preceding ``window_size - 1`` rows they depend on) are
+    calculated and appended to the averages calculated so far.
+
+    Rows must only ever be *appended*; previously seen rows are expected to stay unchanged.
+    To keep updates cheap, only the last rows seen before (the ones the new averages depend
+    on) are checked, and a ``ValueError`` is raised if they've changed.
+    """
+
+    # Every update appends one chunk to the averages; once there are more chunks than this,
+    # they're merged again so that reading the averages doesn't get slower over time
+    MAX_CHUNKS = 64
+
+    def __init__(self, column_name: str = names.CLOSE, window_size: int = 10):
+        self.column_name = column_name
+        self.window_size = window_size
+        self._averages: Series | None = None
+        # The last (up to ``window_size - 1``, but at least one) values seen on the previous call
+        self._tail: Series | None = None
+
+    def update(self, dataframe: DataFrame) -> DataFrame:
+        """
+        Args:
+            dataframe: The input DataFrame containing financial data, i.e. the data passed on
+                       the previous call plus any newly appended rows.
+
+        Returns:
+            DataFrame: The input DataFrame with an additional column containing the Simple
+            Moving Average (for column names, use ``names.sma``).
+
+        Raises:
+            ValueError: If ``dataframe`` doesn't start with the rows passed on the previous call.
+        """
+        values = dataframe[self.column_name]
+        seen = 0 if self._averages is None else len(self._averages)
+        if len(values) < seen:
+            raise ValueError(
+                f"Expected at least {seen} rows, but got {len(values)} (rows can only be appended)"
+            )
+        if self._tail is not None and not values.slice(
+            seen - len(self._tail), len(self._tail)
+        ).equals(self._tail):
+            raise ValueError(
+                f"Rows before row {seen} have changed since the last update (rows can only be appended)"
+            )
+        # Rows needed in front of the new ones to fill their (first) windows
+        overlap = min(seen, self.window_size - 1)
+        new_averages = (
+            values.slice(seen - overlap)
+            .rolling_mean(window_size=self.window_size)
+            .slice(overlap)
+        )
+        if self._averages is None:
+            self._averages = new_averages
+        else:
+            self._averages = concat([self._averages, new_averages], rechunk=False)
+            if self._averages.n_chunks() > self.MAX_CHUNKS:
+                self._averages = self._averages.rechunk()
+        if len(values) > 0:
+            self._tail = values.tail(max(self.window_size - 1, 1))
+        return dataframe.with_columns(
+            self._averages.alias(
+                names.sma(column_name=self.column_name, window_size=self.window_size)
+            )
+        )
+
+
 def exponential_moving_average(
     dataframe: DataFrame, column_name: str = "Close", window_size: int = 10
 ) -> Series:
@@ -79,54 +163,107 @@ def exponential_moving_average(
 
 
 def moving_average_convergence_divergence(
-    dataframe: DataFrame, short: int = 10, long: int = 20, signal: int = 5
-) -> DataFrame:
+    dataframe: Frame,
+    short: int = 10,
+    long: int = 20,
+    signal: int = 5,
+    dtype: PolarsDataType | None = None,
+) -> Frame:
     """
     Calculates the Moving Average Convergence Divergence (MACD) for a given DataFrame and parameters.
 
     Args:
-        dataframe: The input DataFrame containing financial data.
+        dataframe: The input DataFrame (or LazyFrame) containing financial data.
         short: The window size for the short period SMA used in MACD calculation. Default is 10.
         long: The window size for the long period SMA used in MACD calculation. Default is 20.
         signal: The number of periods to use for calculating the signal line
                 (or moving average of MACD). Default is 5.
+        dtype: Optional data type (e.g. ``polars.Float32``) to cast the column to before
+               calculating. Trades precision for speed; default is ``None`` (no cast).
 
     Returns:
-        A new DataFrame with additional columns containing the calculated MACD and its signal line.
+        A new DataFrame with additional columns containing the short and long SMAs, the calculated MACD,
+        its signal line and the MACD histogram (MACD minus signal line).
     """
-    dataframe_with_smas = simple_moving_averages(
-        dataframe=dataframe, column_names=[names.CLOSE], window_sizes=[short, long]
-    )
-    # Define column names here in order to make things a bit more readable
-    sma_short_col = names.sma(names.CLOSE, short)
-    sma_long_col = names.sma(names.CLOSE, long)
-    macd_col = names.macd(short_window=short, long_window=long)
-    sig_col = names.macd_sig(window_size=signal)
-    macd = dataframe_with_smas.with_columns(
-        (col(sma_short_col) - col(sma_long_col)).alias(macd_col)
+    return with_columns_fused(
+        dataframe,
+        *_cached_moving_average_convergence_divergence(
+            short=short, long=long, signal=signal, dtype=dtype
+        ),
     )
-    macd = macd.with_columns(
-        (col(macd_col).rolling_mean(window_size=signal)).alias(sig_col)
+
+
+# Polars expressions are immutable, so the expressions for a MACD can be built once and
+# then be reused for every call with the same parameters (e.g. on every tick of a backtest).
+@lru_cache(maxsize=64)
+def _cached_moving_average_convergence_divergence(
+    short: int, long: int, signal: int, dtype: PolarsDataType | None
+) -> tuple[Expr, ...]:
+    return tuple(
+        moving_average_convergence_divergence_expressions(
+            price=typed_col(names.CLOSE, dtype),
+            column_name=names.CLOSE,
+            short=short,
+            long=long,
+            signal=signal,
+        )
     )
-    return macd.with_columns((col(macd_col) - col(sig_col)))
+
+
+def moving_average_convergence_divergence_expressions(
+    price: Expr, column_name: str, short: int, long: int, signal: int
+) -> list[Expr]:
+    """
+    Builds the expressions calculating the Moving Average Convergence Divergence (MACD), e.g. for
+    combining them with other indicators within one query.
+
+    Args:
+        price: The expression selecting the prices to calculate the MACD on.
+        column_name: The name of the price column (used for naming the SMA columns).
+        short: The window size for the short period SMA.
+        long: The window size for the long period SMA.
+        signal: The number of periods to use for calculating the signal line.
+
+    Returns:
+        The (aliased) expressions for the short and long SMAs, the MACD, its signal line and the
+        MACD histogram, named as by ``moving_average_convergence_divergence``.
+    """
+    # Build the whole calculation as expressions sharing each other so that polars can reuse the
+    # SMAs, the MACD and its signal line between columns instead of materializing each step
+    sma_short = price.rolling_mean(window_size=short)
+    sma_long = price.rolling_mean(window_size=long)
+    macd = sma_short - sma_long
+    sig = macd.rolling_mean(window_size=signal)
+    return [
+        sma_short.alias(names.sma(column_name, short)),
+        sma_long.alias(names.sma(column_name, long)),
+        macd.alias(names.macd(short_window=short, long_window=long)),
+        sig.alias(names.macd_sig(window_size=signal)),
+        (macd - sig).alias(names.macd_hist(window_size=signal)),
+    ]
 
 
 def moving_median(
-    dataframe: DataFrame, column_name: str = names.CLOSE, window_size: int = 10
-):
+    dataframe: Frame,
+    column_name: str = names.CLOSE,
+    window_size: int = 10,
+    dtype: PolarsDataType | None = None,
+) -> Frame:
     """
     Calculates the moving median (MM) for a given DataFrame column and window size.
 
     Args:
-        dataframe: The input DataFrame containing financial data.
+        dataframe: The input DataFrame (or LazyFrame) containing financial data.
         column_name: The name of the column to calculate the Moving Median on. Default is "Close".
         window_size: The number of periods to use for calculating the Moving Median. Default is 10.
+        dtype: Optional data type (e.g. ``polars.Float32``) to cast the column to before
+               calculating. Trades precision for speed; default is ``None`` (no cast).
 
     Returns:
         A new DataFrame with an additional column containing the calculated Moving Median.
     """
     return dataframe.with_columns(
-        (col(column_name).rolling_median(window_size=window_size)).alias(
+        (typed_col(column_name, dtype).rolling_median(window_size=window_size)).alias(
             names.mm(column_name=column_name, window_size=window_size)
         )
     )
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 # OHLC(V) column names used throughout `indicatory`. Constants since they do not change.
 DATE = "Date"
 OPEN = "Open"
@@ -6,17 +8,36 @@ LOW = "Low"
 CLOSE = "Close"
 VOLUME = "Volume"
 
+# Names of indicator columns that don't depend on any parameters. The functions below
+# returning these names are kept for convenience.
+AVG_PRICE = "AVG Price"
+HA_OPEN = f"HA {OPEN}"
+HA_HIGH = f"HA {HIGH}"
+HA_LOW = f"HA {LOW}"
+HA_CLOSE = f"HA {CLOSE}"
+DRET = "Daily Returns"
+DRET_PCT = f"{DRET} (%)"
+DRAN = "Daily Range"
+DRAN_PCT = f"{DRAN} (%)"
+TR = "TR"
+OBV = "OBV"
+RCS_OPEN = "RCS Open"
+RCS_CLOSE = "RCS Close"
+# Earlier versions misspelled the RCS opening price column; kept for downstream consumers
+# that still need to read data written with the old name.
+LEGACY_RCS_OPEN = "RSC Open"
+
+# Name builders for parameterized columns are cached since indicators are typically
+# calculated over and over again with the same parameters (e.g. in backtests).
+NAME_CACHE_SIZE = 1024
+
 
 def avg_price() -> str:
     """
     Returns:
         Name of the column containing the calculated average price data.
     """
-    return "AVG Price"
-
-
-def _heikin_ashi(suffix: str) -> str:
-    return f"HA {suffix}"
+    return AVG_PRICE
 
 
 def ha_open() -> str:
@@ -24,7 +45,7 @@ def ha_open() -> str:
     Returns:
         Name of the column containing the calculated Heikin Ashi opening price data.
     """
-    return _heikin_ashi(OPEN)
+    return HA_OPEN
 
 
 def ha_high() -> str:
@@ -32,7 +53,7 @@ def ha_high() -> str:
     Returns:
         Name of the column containing the calculated Heikin Ashi price data for "daily high".
     """
-    return _heikin_ashi(HIGH)
+    return HA_HIGH
 
 
 def ha_low() -> str:
@@ -40,7 +61,7 @@ def ha_low() -> str:
     Returns:
         Name of the column containing the calculated Heikin Ashi price data for "daily low".
     """
-    return _heikin_ashi(LOW)
+    return HA_LOW
 
 
 def ha_close() -> str:
@@ -48,7 +69,7 @@ def ha_close() -> str:
     Returns:
         Name of the column containing the calculated Heikin Ashi closing price data.
     """
-    return _heikin_ashi(CLOSE)
+    return HA_CLOSE
 
 
 def rcs_open() -> str:
@@ -56,7 +77,7 @@ def rcs_open() -> str:
     Returns:
         Name of the column containing the calculated Relative Currency Strength (RCS) opening price data.
     """
-    return "RSC Open"
+    return RCS_OPEN
 
 
 def rcs_close() -> str:
@@ -64,21 +85,25 @@ def rcs_close() -> str:
     Returns:
         Name of the column containing the calculated Relative Currency Strength (RCS) closing price data.
     """
-    return "RCS Close"
+    return RCS_CLOSE
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def roc(column: str) -> str:
     return f"roc {column}"
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def _with_window_size(name: str, window_size: int) -> str:
     return f"{name} {window_size}"
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def _with_column_and_window_size(name: str, column: str, window_size: int) -> str:
     return f"{_with_window_size(name=name, window_size=window_size)} {column}"
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def sd(base_column: str, window_size: int) -> str:
     """
     Args:
@@ -93,6 +118,7 @@ def sd(base_column: str, window_size: int) -> str:
     )
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def sd_lower(base_column: str, window_size: int):
     """
     Args:
@@ -107,6 +133,7 @@ def sd_lower(base_column: str, window_size: int):
     )
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def sd_upper(base_column: str, window_size: int):
     """
     Args:
@@ -121,6 +148,7 @@ def sd_upper(base_column: str, window_size: int):
     )
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def var(base_column: str, window_size: int) -> str:
     """
     Args:
@@ -135,6 +163,7 @@ def var(base_column: str, window_size: int) -> str:
     )
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def aad(base_column: str, window_size: int) -> str:
     """
     Args:
@@ -149,6 +178,7 @@ def aad(base_column: str, window_size: int) -> str:
     )
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def aad_lower(base_column: str, window_size: int) -> str:
     """
     Args:
@@ -163,6 +193,7 @@ def aad_lower(base_column: str, window_size: int) -> str:
     )
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def aad_upper(base_column: str, window_size: int) -> str:
     """
     Args:
@@ -177,6 +208,7 @@ def aad_upper(base_column: str, window_size: int) -> str:
     )
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def sma(column_name: str, window_size: int) -> str:
     """
     Args:
@@ -191,6 +223,7 @@ def sma(column_name: str, window_size: int) -> str:
     )
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def ema(column_name: str, window_size: int) -> str:
     """
     Args:
@@ -205,6 +238,7 @@ def ema(column_name: str, window_size: int) -> str:
     )
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def macd(short_window: int, long_window: int) -> str:
     """
     Args:
@@ -217,6 +251,7 @@ def macd(short_window: int, long_window: int) -> str:
     return f"MACD {short_window}/{long_window}"
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def macd_sig(window_size: int) -> str:
     """
     Args:
@@ -228,6 +263,20 @@ def macd_sig(window_size: int) -> str:
     return _with_window_size("SIG", window_size=window_size)
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def macd_hist(window_size: int) -> str:
+    """
+    Args:
+        window_size: The number of periods to use for calculating the MACD signal.
+
+    Returns:
+        Name of the column containing the calculated Moving Average Convergence / Divergence (MACD) histogram
+        values (i.e. MACD minus MACD signal).
+    """
+    return _with_window_size("HIST", window_size=window_size)
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def mm(column_name: str, window_size: int) -> str:
     """
     Args:
@@ -242,6 +291,7 @@ def mm(column_name: str, window_size: int) -> str:
     )
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def ppo(column_name: str, short_window_size: int, long_window_size: int) -> str:
     """
     Args:
@@ -255,6 +305,7 @@ def ppo(column_name: str, short_window_size: int, long_window_size: int) -> str:
     return f"PPO {short_window_size}/{long_window_size} {column_name}"
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def rs(window_size: int) -> str:
     """
     Args:
@@ -266,6 +317,7 @@ def rs(window_size: int) -> str:
     return _with_window_size("RS", window_size=window_size)
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def rsi(window_size: int) -> str:
     """
     Args:
@@ -278,6 +330,7 @@ def rsi(window_size: int) -> str:
     return _with_window_size("RSI", window_size=window_size)
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def fast_k(window_size: int) -> str:
     """
     Args:
@@ -289,6 +342,7 @@ def fast_k(window_size: int) -> str:
     return _with_window_size("Fast %K", window_size=window_size)
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def fast_d(window_size: int) -> str:
     """
     Args:
@@ -300,6 +354,7 @@ def fast_d(window_size: int) -> str:
     return _with_window_size("Fast %D", window_size=window_size)
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def slow_k(window_size: int) -> str:
     """
     Args:
@@ -311,6 +366,7 @@ def slow_k(window_size: int) -> str:
     return _with_window_size("Slow %K", window_size=window_size)
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def slow_d(window_size: int) -> str:
     """
     Args:
@@ -327,7 +383,7 @@ def dret() -> str:
     Returns:
         Name of the column containing the calculated Daily Returns.
     """
-    return "Daily Returns"
+    return DRET
 
 
 def dret_pct() -> str:
@@ -335,7 +391,7 @@ def dret_pct() -> str:
     Returns:
         Name of the column containing the calculated Daily Returns (in percent).
     """
-    return dret() + " (%)"
+    return DRET_PCT
 
 
 def dran() -> str:
@@ -343,7 +399,7 @@ def dran() -> str:
     Returns:
         Name of the column containing the calculated Daily Range values.
     """
-    return "Daily Range"
+    return DRAN
 
 
 def dran_pct() -> str:
@@ -351,7 +407,7 @@ def dran_pct() -> str:
     Returns:
         Name of the column containing the calculated Daily Range values (in percent).
     """
-    return dran() + " (%)"
+    return DRAN_PCT
 
 
 def tr() -> str:
@@ -359,9 +415,10 @@ def tr() -> str:
     Returns:
         Name of the column containing the calculated True Range values.
     """
-    return "TR"
+    return TR
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def atr(window_size: int) -> str:
     """
     Args:
@@ -373,6 +430,7 @@ def atr(window_size: int) -> str:
     return _with_window_size("ATR", window_size=window_size)
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def atr_pct(window_size: int) -> str:
     """
     Args:
@@ -389,9 +447,10 @@ def obv() -> str:
     Returns:
         Name of the column containing the calculated On-Balance Volume (OBV).
     """
-    return "OBV"
+    return OBV
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def pv(column_name: str) -> str:
     """
     Args:
@@ -403,11 +462,13 @@ def pv(column_name: str) -> str:
     return f"PV {column_name}"
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def dpo(column_name: str, window_size: int) -> str:
     return _with_column_and_window_size(
         "DPO", column=column_name, window_size=window_size
     )
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def cdf(column_1: str, column_2: str) -> str:
     return f"cdf {column_1}-{column_2}"
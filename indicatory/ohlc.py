@@ -1,71 +1,54 @@
 import indicatory.names as names
 
-from polars import DataFrame, col
+from polars import col, max_horizontal, min_horizontal
 
+from indicatory.frames import Frame, collect_like
 
-def average_price(dataframe: DataFrame) -> DataFrame:
+
+def average_price(dataframe: Frame) -> Frame:
     """
     Calculates the average price (AP) for each row in a given DataFrame.
 
     Args:
-        dataframe: A polars DataFrame containing "OHLC" data.
+        dataframe: A polars DataFrame or LazyFrame containing "OHLC" data.
 
     Returns:
-        The input DataFrame with an additional column named ``names.avg_price()`` that contains the
+        The input DataFrame with an additional column named ``names.AVG_PRICE`` that contains the
         average price for each row.
     """
     return dataframe.with_columns(
-        ((col.Open + col.High + col.Low + col.Close) / 4.0).alias(names.avg_price())
+        ((col.Open + col.High + col.Low + col.Close) / 4.0).alias(names.AVG_PRICE)
     )
 
 
-def naive_heikin_ashi(dataframe: DataFrame) -> DataFrame:
+def naive_heikin_ashi(dataframe: Frame) -> Frame:
     """
     Implements Heikin-Ashi candles for a given DataFrame containing financial data.
 
     Args:
-        dataframe: A polars DataFrame containing asset price data.
+        dataframe: A polars DataFrame or LazyFrame containing asset price data.
                    It should have columns named 'Date', 'Open', 'High', 'Low', and 'Close'.
 
     Returns:
-        The input DataFrame with additional columns for the Heikin-Ashi open, high, low, and close
-        prices (for column names, use the ``indicatory.names`` module).
+        The input DataFrame, sorted by 'Date', with additional columns for the Heikin-Ashi open,
+        high, low, and close prices (for column names, use the ``indicatory.names`` module).
     """
-
-    # NOTE: This is a rather "naive" (i.e. un-optimized) version of Heikin-Ashi-Candles.
-    records = sorted(dataframe.rows(), key=lambda record: record[0])
-
-    dates = []
-    ha_open = []
-    ha_high = []
-    ha_low = []
-    ha_close = []
-    for i in range(len(records)):
-        current_record = records[i]
-        if i == 0:
-            # first line
-            cur_date, cur_open, cur_high, cur_low, cur_close = current_record
-            dates.append(cur_date)
-            ha_open.append((cur_open + cur_close) / 2.0)
-            ha_high.append(cur_high)
-            ha_low.append(cur_low)
-            ha_close.append((cur_open + cur_high + cur_low + cur_close) / 4.0)
-        else:
-            cur_date, cur_open, cur_high, cur_low, cur_close = current_record
-            prev_open = ha_open[i - 1]
-            prev_close = ha_close[i - 1]
-            dates.append(cur_date)
-            ha_open.append((prev_open + prev_close) / 2.0)
-            ha_high.append(max(cur_high, prev_open, prev_close))
-            ha_low.append(max(cur_low, prev_open, prev_close))
-            ha_close.append((cur_open + cur_high + cur_low + cur_close) / 4.0)
-    ha_dataframe = DataFrame(
-        {
-            names.DATE: dates,
-            names.ha_open(): ha_open,
-            names.ha_high(): ha_high,
-            names.ha_low(): ha_low,
-            names.ha_close(): ha_close,
-        }
+    # HA Close = (Open + High + Low + Close) / 4
+    ha_close = (col.Open + col.High + col.Low + col.Close) / 4.0
+    # HA Open = (previous HA Open + previous HA Close) / 2, starting with (Open + Close) / 2.
+    # That's an exponential moving average with alpha = 1/2 over [first open, HA Close(0),
+    # HA Close(1), ...], so there's no need to loop over the rows in Python.
+    ha_open = ha_close.shift(1, fill_value=(col.Open + col.Close) / 2.0).ewm_mean(
+        alpha=0.5, adjust=False, ignore_nulls=False
+    )
+    return collect_like(
+        dataframe,
+        dataframe.lazy()
+        .sort(names.DATE)
+        .with_columns(
+            ha_open.alias(names.HA_OPEN),
+            max_horizontal(col.High, ha_open, ha_close).alias(names.HA_HIGH),
+            min_horizontal(col.Low, ha_open, ha_close).alias(names.HA_LOW),
+            ha_close.alias(names.HA_CLOSE),
+        ),
     )
-    return dataframe.join(ha_dataframe, on=names.DATE)
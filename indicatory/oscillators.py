@@ -1,13 +1,10 @@
-import numpy as np
 import polars
 
 import indicatory.names as names
 
-from polars import DataFrame, Series, col
-from indicatory.means_medians import (
-    simple_moving_average,
-    simple_moving_averages,
-)
+from polars import Expr, col, when
+from indicatory.frames import Frame, with_columns_fused
+from indicatory.means_medians import simple_moving_averages
 
 # I'm defining the names of those columns as local constants in this module since
 # they're not used anywhere else
@@ -16,15 +13,15 @@ LOSSES_COL = "Losses"
 
 
 def percentage_price_oscillator(
-    dataframe: DataFrame,
+    dataframe: Frame,
     short_window_size: int = 10,
     long_window_size: int = 20,
-) -> DataFrame:
+) -> Frame:
     """
     Calculates Percentage Price Oscillator (PPO) for a given dataframe with financial data ("OHLC").
 
     Args:
-        dataframe: The input dataframe with financial data. It should contain at least one column
+        dataframe: The input dataframe (eager or lazy) with financial data. It should contain at least one column
                    named 'Close' which represents the closing price of the asset.
         short_window_size: Size of the window for calculating short moving average. Defaults to 10.
         long_window_size: Size of the window for calculating long moving average. Defaults to 20.
@@ -33,58 +30,38 @@ def percentage_price_oscillator(
         A new dataframe with added column representing PPO.
     """
     close_column = names.CLOSE
-    short_col = names.sma(column_name=close_column, window_size=short_window_size)
-    long_col = names.sma(column_name=close_column, window_size=long_window_size)
     ppo_col = names.ppo(
         column_name=close_column,
         short_window_size=short_window_size,
         long_window_size=long_window_size,
     )
-    return (
-        # Start with SMAs with window sizes "short" and "long"
-        simple_moving_averages(
-            dataframe=dataframe,
-            window_sizes=[short_window_size, long_window_size],
-            column_names=[close_column],
-        )
-        .with_columns(
-            # Calculate Percentage Price Oscillator (based on short / long SMAs)
-            (((col(short_col) - col(long_col)) / col(long_col)) * 100).alias(ppo_col)
-        )
-        # Drop columns for short and long SMAs since they were only needed to calculate PPO
-        .drop([short_col, long_col])
+    # The SMAs are only needed to calculate PPO, so they aren't added as columns at all.
+    # Running this as one query lets polars calculate the long SMA only once.
+    short_sma = col(close_column).rolling_mean(window_size=short_window_size)
+    long_sma = col(close_column).rolling_mean(window_size=long_window_size)
+    return with_columns_fused(
+        dataframe, (((short_sma - long_sma) / long_sma) * 100).alias(ppo_col)
     )
 
 
-def _gains(close_vals: polars.Series) -> float:
-    previous_close = close_vals.item(0)
-    current_close = close_vals.item(-1)
-    return max(current_close - previous_close, 0.0)
-
-
-def _losses(close_vals: polars.Series) -> float:
-    previous_close = close_vals.item(0)
-    current_close = close_vals.item(-1)
-    return max(previous_close - current_close, 0.0)
-
-
-def _moving_gains_and_losses(dataframe: DataFrame) -> DataFrame:
+def _gains_and_losses() -> tuple[Expr, Expr]:
     # NOTE: Gains and losses are *absolute* (i.e. positive) values
-    return dataframe.with_columns(
-        # Column 'Gains'
-        col.Close.rolling_map(_gains, window_size=2)
-        .fill_null(value=0.0)
-        .alias(GAINS_COL),
-        # Column 'Losses'
-        col.Close.rolling_map(_losses, window_size=2)
-        .fill_null(value=0.0)
-        .alias(LOSSES_COL),
+    change = col.Close.diff()
+    return (
+        change.clip(lower_bound=0.0).fill_null(value=0.0),
+        # via abs() rather than negation to avoid -0.0
+        change.clip(upper_bound=0.0).abs().fill_null(value=0.0),
     )
 
 
+def _moving_gains_and_losses(dataframe: Frame) -> Frame:
+    gains, losses = _gains_and_losses()
+    return dataframe.with_columns(gains.alias(GAINS_COL), losses.alias(LOSSES_COL))
+
+
 def _simple_moving_average_gains_and_losses(
-    dataframe: DataFrame, window_size: int = 10
-) -> DataFrame:
+    dataframe: Frame, window_size: int = 10
+) -> Frame:
     dataframe_with_gains_and_losses = _moving_gains_and_losses(dataframe)
     return simple_moving_averages(
         dataframe=dataframe_with_gains_and_losses,
@@ -93,75 +70,62 @@ def _simple_moving_average_gains_and_losses(
     )
 
 
-def _calculate_current_average_gains_losses(
-    current_value: float, previous_average: float, window_size: int
-) -> float:
-    return (previous_average * (window_size - 1) + current_value) / window_size
-
-
-def _calculate_moving_average_gains_losses(s: Series, window_size: int) -> Series:
-    results = []
-    for i in range(s.count()):
-        if i < window_size - 1:
-            results.append(None)
-        elif i == window_size - 1:
-            results.append(s[:window_size].mean())
-        else:
-            new_average = _calculate_current_average_gains_losses(
-                current_value=s[i],
-                previous_average=results[i - 1],
-                window_size=window_size,
-            )
-            results.append(new_average)
-    return Series(results)
+def _wilder_moving_average(values: Expr, window_size: int) -> Expr:
+    # Let n = window_size. The first average is the simple average of the first n values.
+    # After that, each new value is calculated as such:
+    #   new_avg = (prev_avg * (n-1) + cur) / n
+    #           = (1 - 1/n) * prev_avg + (1/n) * cur
+    # which is an exponential moving average with alpha = 1/n, seeded with the first SMA.
+    row = polars.int_range(0, polars.len())
+    seeded = (
+        when(row < window_size - 1)
+        .then(None)
+        .when(row == window_size - 1)
+        .then(values.rolling_mean(window_size=window_size))
+        .otherwise(values)
+    )
+    return seeded.ewm_mean(alpha=1.0 / window_size, adjust=False, ignore_nulls=True)
 
 
 def _exponential_moving_average_gains_and_losses(
-    dataframe: DataFrame, window_size: int = 10
-) -> DataFrame:
-    # Let n = window_size, gains = values of column 'Gains', losses = values of column 'Losses'.
-    # The first n values of gains and losses are calculated as a simple average.
-    # After that, each new value is calculated as such:
-    #   new_avg_gains = (prev_avg_gains * (n-1) + cur_gains) / n
-    #   new_avg_losses = (prev_agv_loss * (n-1) + cur_loss) / n
-    dataframe_with_gains_and_losses = _moving_gains_and_losses(dataframe)
-    ema_gains = _calculate_moving_average_gains_losses(
-        s=dataframe_with_gains_and_losses[GAINS_COL], window_size=window_size
-    )
-    ema_losses = _calculate_moving_average_gains_losses(
-        s=dataframe_with_gains_and_losses[LOSSES_COL], window_size=window_size
-    )
-    return dataframe.with_columns(
-        ema_gains.alias(names.ema(GAINS_COL, window_size)),
-        ema_losses.alias(names.ema(LOSSES_COL, window_size)),
+    dataframe: Frame, window_size: int = 10
+) -> Frame:
+    gains, losses = _gains_and_losses()
+    return with_columns_fused(
+        dataframe,
+        _wilder_moving_average(gains, window_size).alias(
+            names.ema(GAINS_COL, window_size)
+        ),
+        _wilder_moving_average(losses, window_size).alias(
+            names.ema(LOSSES_COL, window_size)
+        ),
     )
 
 
 def _relative_strength_index(
-    moving_average_gains_and_losses: DataFrame,
-    window_size: int,
-    gains_col: str,
-    losses_col: str,
-) -> DataFrame:
-    rs_col = names.rs(window_size=window_size)
-    # TODO Drop 'intermediate' columns?
-    return moving_average_gains_and_losses.with_columns(
-        # Calculate Relative Strength = (SMA gains) / (SMA losses)
-        (col(gains_col) / col(losses_col))
-        .alias(rs_col)
-        # 'Cast' division errors ("divide-by-zero") and "null' values to zero
-        .fill_nan(value=0.0)
+    average_gains: Expr, average_losses: Expr, window_size: int
+) -> list[Expr]:
+    # Calculate Relative Strength = (average gains) / (average losses)
+    # Guard against division by zero (which would yield 'inf' or 'NaN') up front and
+    # 'cast' "null" values to zero
+    rs = (
+        when(average_losses == 0.0)
+        .then(0.0)
+        .otherwise(average_gains / average_losses)
         .fill_null(value=0.0)
-        .replace(old=np.inf, new=0.0)
-    ).with_columns(
-        # Convert Relative Strength values to a "Relative Strength Index" between 0 and 100
-        (100.0 - (100.0 / (1.0 + col(rs_col)))).alias(names.rsi(window_size))
     )
+    # Convert Relative Strength values to a "Relative Strength Index" between 0 and 100.
+    # Without any losses, RS is infinite and the RSI therefore 100.
+    rsi = (
+        when(average_losses == 0.0).then(100.0).otherwise(100.0 - (100.0 / (1.0 + rs)))
+    )
+    return [
+        rs.alias(names.rs(window_size=window_size)),
+        rsi.alias(names.rsi(window_size)),
+    ]
 
 
-def simple_relative_strength_index(
-    dataframe: DataFrame, window_size: int = 10
-) -> DataFrame:
+def simple_relative_strength_index(dataframe: Frame, window_size: int = 10) -> Frame:
     """
     Calculates a "simpler" version of the Relative Strength Index (RSI) for a given dataframe
     of financial data ("OHLC").
@@ -172,7 +136,7 @@ def simple_relative_strength_index(
     For more information, see `Cutler's RSI <https://en.wikipedia.org/wiki/Relative_strength_index#Cutler's_RSI>`_
 
     Args:
-        dataframe: The input dataframe with financial data. It should contain at least two columns named
+        dataframe: The input dataframe (eager or lazy) with financial data. It should contain at least two columns named
                    'Gains' and 'Losses', which represent the gains and losses of the asset respectively.
         window_size: Size of the window for calculating Exponential Moving Average. Defaults to 10.
 
@@ -180,25 +144,30 @@ def simple_relative_strength_index(
         A new dataframe with added column representing RSI values.
     """
     # https://en.wikipedia.org/wiki/Relative_strength_index#Cutler's_RSI
-    gains_col = names.sma(GAINS_COL, window_size)
-    losses_col = names.sma(LOSSES_COL, window_size)
-    moving_average_gains_and_losses = _simple_moving_average_gains_and_losses(
-        dataframe=dataframe, window_size=window_size
-    )
-    return _relative_strength_index(
-        moving_average_gains_and_losses=moving_average_gains_and_losses,
-        window_size=window_size,
-        gains_col=gains_col,
-        losses_col=losses_col,
+    gains, losses = _gains_and_losses()
+    average_gains = gains.rolling_mean(window_size=window_size)
+    average_losses = losses.rolling_mean(window_size=window_size)
+    # Gains, losses, their averages and the RSI are all calculated within one query
+    return with_columns_fused(
+        dataframe,
+        gains.alias(GAINS_COL),
+        losses.alias(LOSSES_COL),
+        average_gains.alias(names.sma(GAINS_COL, window_size)),
+        average_losses.alias(names.sma(LOSSES_COL, window_size)),
+        *_relative_strength_index(
+            average_gains=average_gains,
+            average_losses=average_losses,
+            window_size=window_size,
+        ),
     )
 
 
-def relative_strength_index(dataframe: DataFrame, window_size: int = 10):
+def relative_strength_index(dataframe: Frame, window_size: int = 10) -> Frame:
     """
     Calculates the Relative Strength Index (RSI) for a given dataframe of financial data ("OHLC").
 
     Args:
-        dataframe: The input dataframe with financial data. It should contain at least two
+        dataframe: The input dataframe (eager or lazy) with financial data. It should contain at least two
                    columns named 'Gains' and 'Losses', which represent the gains and losses
                    of the asset respectively.
         window_size: Size of the window for calculating Exponential Moving Average. Defaults to 10.
@@ -206,25 +175,28 @@ def relative_strength_index(dataframe: DataFrame, window_size: int = 10):
     Returns:
         A new dataframe with added column representing RSI values.
     """
-    gains_col = names.ema(GAINS_COL, window_size)
-    losses_col = names.ema(LOSSES_COL, window_size)
-    moving_average_gains_and_losses = _exponential_moving_average_gains_and_losses(
-        dataframe=dataframe, window_size=window_size
-    )
-    return _relative_strength_index(
-        moving_average_gains_and_losses=moving_average_gains_and_losses,
-        window_size=window_size,
-        gains_col=gains_col,
-        losses_col=losses_col,
+    gains, losses = _gains_and_losses()
+    average_gains = _wilder_moving_average(gains, window_size)
+    average_losses = _wilder_moving_average(losses, window_size)
+    # Gains, losses, their averages and the RSI are all calculated within one query
+    return with_columns_fused(
+        dataframe,
+        average_gains.alias(names.ema(GAINS_COL, window_size)),
+        average_losses.alias(names.ema(LOSSES_COL, window_size)),
+        *_relative_strength_index(
+            average_gains=average_gains,
+            average_losses=average_losses,
+            window_size=window_size,
+        ),
     )
 
 
-def stochastic_oscillator(dataframe: DataFrame, window_size: int = 5):
+def stochastic_oscillator(dataframe: Frame, window_size: int = 5) -> Frame:
     """
     Calculates the Stochastic Oscillator (SO) for a given dataframe of financial data.
 
     Args:
-        dataframe: The input dataframe with financial data. It should contain at least
+        dataframe: The input dataframe (eager or lazy) with financial data. It should contain at least
                    three columns named 'Close', 'High' and 'Low', which represent the closing price,
                    highest price and lowest price of the security respectively.
         window_size: Size of the window for calculating rolling min/max and moving average. Defaults to 5.
@@ -253,38 +225,32 @@ def stochastic_oscillator(dataframe: DataFrame, window_size: int = 5):
     slow_k = names.slow_k(window_size)
     slow_d = names.slow_d(window_size)
 
-    # Calculate the lowest low and highest high over last 'n' days
-    dataframe = dataframe.with_columns(
-        [
-            col(names.LOW).rolling_min(window_size=window_size).alias(low_window),
-            col(names.HIGH).rolling_max(window_size=window_size).alias(high_window),
-        ]
+    # Lowest low and highest high over last 'n' days
+    lowest_low = col(names.LOW).rolling_min(window_size=window_size)
+    highest_high = col(names.HIGH).rolling_max(window_size=window_size)
+    # In a flat window (highest high == lowest low), Fast %K would be NaN (or inf) and spread
+    # into all moving averages based on it, so it's set to zero instead
+    price_range = highest_high - lowest_low
+    fast_k_values = (
+        when(price_range == 0.0)
+        .then(0.0)
+        .otherwise((col(names.CLOSE) - lowest_low) / price_range * 100)
     )
-
-    # Calculate Fast %K
-    dataframe = dataframe.with_columns(
-        (
-            (col(names.CLOSE) - col(low_window))
-            / (col(high_window) - col(low_window))
-            * 100
-        ).alias(fast_k)
-    )
-
-    # Calculate Fast %D
-    dataframe = dataframe.with_columns(
-        col(fast_k).rolling_mean(window_size=window_size).alias(fast_d)
-    )
-
-    # Calculate Slow %K (= Fast %D)
-    dataframe = dataframe.with_columns(col(fast_d).alias(slow_k))
-
-    # Calculate Slow %D (= SMA_N(Slow %K))
-    return dataframe.with_columns(
-        col(slow_k).rolling_mean(window_size=window_size).alias(slow_d)
+    fast_d_values = fast_k_values.rolling_mean(window_size=window_size)
+    # Slow %K is the same as Fast %D; all columns are calculated within one query so that
+    # polars can share the rolling min / max and Fast %D between them
+    return with_columns_fused(
+        dataframe,
+        lowest_low.alias(low_window),
+        highest_high.alias(high_window),
+        fast_k_values.alias(fast_k),
+        fast_d_values.alias(fast_d),
+        fast_d_values.alias(slow_k),
+        fast_d_values.rolling_mean(window_size=window_size).alias(slow_d),
     )
 
 
-def column_difference(dataframe: DataFrame, column_1: str, column_2: str) -> DataFrame:
+def column_difference(dataframe: Frame, column_1: str, column_2: str) -> Frame:
     """
     Calculate the "Column Difference" (CDF) for two given columns in a dataframe.
 
@@ -292,7 +258,7 @@ def column_difference(dataframe: DataFrame, column_1: str, column_2: str) -> Dat
     the values in column ``column_1``.
 
     Args:
-        dataframe: A (polars) DataFrame containing time series data (OHLC + indicators).
+        dataframe: A (polars) DataFrame or LazyFrame containing time series data (OHLC + indicators).
         column_1: The name of the column whose values act as *minuends*.
         column_2: The name of the column whose values act as *subtrahends*.
 
@@ -309,8 +275,8 @@ def column_difference(dataframe: DataFrame, column_1: str, column_2: str) -> Dat
 
 
 def detrended_price_oscillator(
-    dataframe: DataFrame, price_column: str = names.CLOSE, window_size: int = 10
-) -> DataFrame:
+    dataframe: Frame, price_column: str = names.CLOSE, window_size: int = 10
+) -> Frame:
     """
     Calculate the Detrended Price Oscillator (DPO) for a given column in a dataframe.
 
@@ -318,7 +284,7 @@ def detrended_price_oscillator(
     price and the "current price", shifted by a "half the window size plus one" period.
 
     Args:
-        dataframe: A (polars) DataFrame containing time series data (OHLC + indicators).
+        dataframe: A (polars) DataFrame or LazyFrame containing time series data (OHLC + indicators).
         price_column: The name of the column to calculate DPO on; defaults to 'CLOSE'.
         window_size: The size of the moving window for calculating averages; defaults to 10 periods.
 
@@ -326,17 +292,17 @@ def detrended_price_oscillator(
         A new (polars) DataFrame with an additional column containing the calculated DPO values.
     """
     shift = int(window_size / 2.0) + 1
-    return simple_moving_average(
-        dataframe=dataframe, window_size=window_size, column_name=price_column
-    ).with_columns(
-        (
-            col(price_column).shift(shift)
-            - col(names.sma(column_name=price_column, window_size=window_size))
-        ).alias(names.dpo(column_name=price_column, window_size=window_size))
+    sma = col(price_column).rolling_mean(window_size=window_size)
+    return with_columns_fused(
+        dataframe,
+        sma.alias(names.sma(column_name=price_column, window_size=window_size)),
+        (col(price_column).shift(shift) - sma).alias(
+            names.dpo(column_name=price_column, window_size=window_size)
+        ),
     )
 
 
-def rate_of_change(dataframe: DataFrame, column: str) -> DataFrame:
+def rate_of_change(dataframe: Frame, column: str) -> Frame:
     """
     Calculate the Rate of Change (ROC) for a given column in a Polars dataframe.
 
@@ -345,13 +311,11 @@ def rate_of_change(dataframe: DataFrame, column: str) -> DataFrame:
     change between two data points, not a relative one.
 
     Args:
-        dataframe: A (polars) DataFrame containing the time series data.
+        dataframe: A (polars) DataFrame or LazyFrame containing the time series data.
         column: The name of the column to calculate ROC on.
 
     Returns:
         A new Polars DataFrame with an additional column containing the calculated ROC values.
     """
     diff_column = names.roc(column)
-    return dataframe.with_columns(
-        (col(column) - col(column).shift(1)).alias(diff_column)
-    )
+    return dataframe.with_columns(col(column).diff().alias(diff_column))
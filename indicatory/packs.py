@@ -0,0 +1,73 @@
+import indicatory.names as names
+
+from polars import Expr, col
+
+from indicatory.deviations import (
+    MAX_SHIFTED_WINDOW_SIZE,
+    rolling_mean_absolute_deviation,
+)
+from indicatory.frames import Frame, with_columns_fused, with_columns_indexed
+from indicatory.means_medians import moving_average_convergence_divergence_expressions
+
+
+def indicator_pack(
+    dataframe: Frame,
+    column_name: str = names.CLOSE,
+    sma_windows: tuple[int, ...] = (),
+    sd_windows: tuple[int, ...] = (),
+    var_windows: tuple[int, ...] = (),
+    aad_windows: tuple[int, ...] = (),
+    mm_windows: tuple[int, ...] = (),
+    macd: tuple[int, int, int] | None = None,
+) -> Frame:
+    """
+    Calculates several rolling indicators for the same column within a single polars query.
+
+    Calling e.g. ``simple_moving_average``, ``standard_deviation`` and ``moving_median`` one
+    after another runs one query per indicator, each reading the same column again. This
+    function combines all requested indicators into one query instead.
+
+    Args:
+        dataframe: The input DataFrame (or LazyFrame) containing financial data.
+        column_name: The name of the column to calculate the indicators on. Defaults to 'Close'.
+        sma_windows: Window sizes for Simple Moving Averages (see ``names.sma``).
+        sd_windows: Window sizes for rolling standard deviations (see ``names.sd``).
+        var_windows: Window sizes for rolling variances (see ``names.var``).
+        aad_windows: Window sizes for Average Absolute Deviations (see ``names.aad``).
+        mm_windows: Window sizes for Moving Medians (see ``names.mm``).
+        macd: Window sizes ``(short, long, signal)`` for the Moving Average Convergence Divergence
+              (see ``names.macd``, ``names.macd_sig`` and ``names.macd_hist``). If ``None`` (default),
+              no MACD is calculated.
+
+    Returns:
+        A new DataFrame (or LazyFrame) with additional columns for all requested indicators. The
+        columns are named the same way as by the corresponding single indicator functions.
+    """
+    price = col(column_name)
+    # Use dicts (instead of lists) to drop duplicate column names, e.g. if an SMA
+    # is requested explicitly and is part of the MACD as well
+    exprs: dict[str, Expr] = {}
+    for window_size in sma_windows:
+        exprs[names.sma(column_name, window_size)] = price.rolling_mean(window_size)
+    for window_size in sd_windows:
+        exprs[names.sd(column_name, window_size)] = price.rolling_std(window_size)
+    for window_size in var_windows:
+        exprs[names.var(column_name, window_size)] = price.rolling_var(window_size)
+    for window_size in aad_windows:
+        exprs[names.aad(column_name, window_size)] = rolling_mean_absolute_deviation(
+            column_name=column_name, window_size=window_size
+        )
+    for window_size in mm_windows:
+        exprs[names.mm(column_name, window_size)] = price.rolling_median(window_size)
+    if macd is not None:
+        short, long, signal = macd
+        for expr in moving_average_convergence_divergence_expressions(
+            price=price, column_name=column_name, short=short, long=long, signal=signal
+        ):
+            exprs[expr.meta.output_name()] = expr
+    # Only rolling mean absolute deviations over large windows need the (temporary) row index
+    needs_row_index = any(
+        window_size > MAX_SHIFTED_WINDOW_SIZE for window_size in aad_windows
+    )
+    with_columns = with_columns_indexed if needs_row_index else with_columns_fused
+    return with_columns(dataframe, *(expr.alias(name) for name, expr in exprs.items()))
@@ -0,0 +1,166 @@
+from typing import Iterable
+
+import indicatory.names as names
+
+from polars import DataFrame, Datetime, Expr, Float64, Int64, String, col, when
+
+from indicatory.frames import Frame, with_columns_fused
+from indicatory.position import LongPosition, Price
+
+# Column names of a "prices frame" (one row per price)
+BID = "Bid"
+ASK = "Ask"
+SPREAD = "Spread"
+SPREAD_PERCENT = "Spread Percent"
+
+# Column names of a "positions frame" (one row per position)
+SYMBOL = "Symbol"
+EXCHANGE = "Exchange"
+ACCOUNT_SIZE = "Account Size"
+OPENING_ASK = "Opening Ask"
+CLOSING_BID = "Closing Bid"
+RISK_PER_TRADE = "Risk Per Trade"
+RISK_PERCENTAGE = "Risk Percentage"
+FIXED_FEE = "Fixed Fee"
+VARIABLE_FEE = "Variable Fee"
+
+# Columns added by ``long_positions``
+SHARES = "Shares"
+SIZE = "Position Size"
+STOP_LOSS = "Stop-Loss"
+OPENING_COSTS = "Opening Costs"
+CLOSING_COSTS = "Closing Costs"
+NET_RETURNS = "Net Returns"
+NET_RETURNS_PCT = "Net Returns (%)"
+FINAL_RETURNS = "Final Returns"
+
+
+def prices_frame(prices: Iterable[Price]) -> DataFrame:
+    """
+    Collects several prices into a dataframe with one row per price.
+
+    Args:
+        prices: The prices (quotes).
+
+    Returns:
+        A DataFrame with columns 'Date', 'Bid' and 'Ask' that can be passed to ``price_spreads``.
+    """
+    return DataFrame(
+        [(price.date_time, price.bid, price.ask) for price in prices],
+        # Declared explicitly, since polars would infer e.g. integer columns from integer prices
+        # (or null columns from no prices at all)
+        schema={names.DATE: Datetime, BID: Float64, ASK: Float64},
+        orient="row",
+    )
+
+
+def price_spreads(dataframe: Frame) -> Frame:
+    """
+    Calculates the spreads of many prices at once (see ``Price.spread``).
+
+    Args:
+        dataframe: A DataFrame or LazyFrame with one row per price, e.g. from ``prices_frame``.
+
+    Returns:
+        A new DataFrame (or LazyFrame) with additional columns for the spread's amount and its
+        percentage of the ask price (use the constants of module ``indicatory.portfolio`` for
+        column names). As with ``Price.spread``, the percentage is a fraction rounded to six decimals.
+    """
+    spread = (col(ASK) - col(BID)).abs()
+    return with_columns_fused(
+        dataframe,
+        spread.alias(SPREAD),
+        (spread / col(ASK)).round(6).alias(SPREAD_PERCENT),
+    )
+
+
+def positions_frame(positions: Iterable[LongPosition]) -> DataFrame:
+    """
+    Collects the specs of several long positions into a dataframe with one row per position.
+
+    Args:
+        positions: The (open or closed) long positions.
+
+    Returns:
+        A DataFrame that can be passed to ``long_positions`` (use the constants of module
+        ``indicatory.portfolio`` for column names). For open positions, the closing bid is null.
+    """
+    return DataFrame(
+        [
+            (
+                position.asset.symbol,
+                position.asset.exchange,
+                position.account_size,
+                position.opening_price.ask,
+                None if position.is_open() else position.close_price.bid,
+                position.risk_per_trade,
+                position.risk_percentage,
+                position.fixed_fee,
+                position.variable_fee,
+            )
+            for position in positions
+        ],
+        # Declared explicitly, since polars would infer e.g. integer columns from integer prices
+        # (or null columns from no positions at all)
+        schema={
+            SYMBOL: String,
+            EXCHANGE: String,
+            ACCOUNT_SIZE: Float64,
+            OPENING_ASK: Float64,
+            CLOSING_BID: Float64,
+            RISK_PER_TRADE: Float64,
+            RISK_PERCENTAGE: Float64,
+            FIXED_FEE: Float64,
+            VARIABLE_FEE: Float64,
+        },
+        orient="row",
+    )
+
+
+def _round_half_to_even(values: Expr) -> Expr:
+    # polars rounds halves away from zero, Python's ``round`` (as used by LongPosition)
+    # rounds them to the nearest even number
+    lower = values.floor()
+    # For halves, the even one of ``lower`` and ``lower + 1`` (polars' modulo has the sign of
+    # the divisor like Python's, so this works for negative values, too)
+    return (
+        when(values - lower == 0.5).then(lower + lower % 2).otherwise(values.round(0))
+    )
+
+
+def long_positions(dataframe: Frame) -> Frame:
+    """
+    Calculates shares, size, stop-loss, costs and returns for many long positions at once.
+
+    This is the columnar counterpart to ``LongPosition``: instead of calling its methods once per
+    position, every value is calculated for all positions within a single polars query.
+
+    Args:
+        dataframe: A DataFrame or LazyFrame with one row per position, e.g. from ``positions_frame``.
+
+    Returns:
+        A new DataFrame (or LazyFrame) with additional columns for shares, position size,
+        stop-loss, opening and closing costs (totals) and returns (use the constants of module
+        ``indicatory.portfolio`` for column names). Closing costs and returns are null for open
+        positions. Values rounded to three decimals (stop-loss, returns) may differ from
+        ``LongPosition`` in the last decimal if they're exactly halfway between two decimals.
+    """
+    shares = _round_half_to_even(
+        col(RISK_PER_TRADE) / col(RISK_PERCENTAGE) / col(OPENING_ASK)
+    ).cast(Int64)
+    size = shares * col(OPENING_ASK)
+    opening_costs = col(FIXED_FEE) + size * col(VARIABLE_FEE)
+    closing_volume = shares * col(CLOSING_BID)
+    closing_costs = col(FIXED_FEE) + closing_volume * col(VARIABLE_FEE)
+    gains_losses = closing_volume - size
+    return with_columns_fused(
+        dataframe,
+        shares.alias(SHARES),
+        size.alias(SIZE),
+        (col(OPENING_ASK) * (1.0 - col(RISK_PERCENTAGE))).round(3).alias(STOP_LOSS),
+        opening_costs.alias(OPENING_COSTS),
+        closing_costs.alias(CLOSING_COSTS),
+        gains_losses.round(3).alias(NET_RETURNS),
+        (gains_losses / size).alias(NET_RETURNS_PCT),
+        (gains_losses - (opening_costs + closing_costs)).round(3).alias(FINAL_RETURNS),
+    )
@@ -1,36 +1,55 @@
-from dataclasses import dataclass, asdict
+import json
+import logging
+
+from dataclasses import dataclass, field
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Asset:
     symbol: str
     exchange: str
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {"symbol": self.symbol, "exchange": self.exchange}
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Price:
     bid: float
     ask: float
     date_time: datetime
+    # Prices don't change once they've been quoted, so the spread and the ISO formatted
+    # date/time are only calculated once (on first use, so that quoting a price never fails)
+    _spread: tuple[float, float] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _date_time_iso: str | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def spread(self) -> tuple[float, float]:
-        amount = abs(self.ask - self.bid)
-        percent = round(amount / self.ask, 6)
-        return amount, percent
+        if self._spread is None:
+            amount = abs(self.ask - self.bid)
+            # (frozen dataclasses can only set their fields via object.__setattr__)
+            object.__setattr__(self, "_spread", (amount, round(amount / self.ask, 6)))
+        return self._spread
 
     def to_dict(self) -> dict:
-        result = asdict(self)
-        result["date_time"] = result["date_time"].isoformat()
         val, pct = self.spread()
-        result["spread"] = {"amount": val, "percent": pct}
-        return result
+        if self._date_time_iso is None:
+            object.__setattr__(self, "_date_time_iso", self.date_time.isoformat())
+        return {
+            "bid": self.bid,
+            "ask": self.ask,
+            "date_time": self._date_time_iso,
+            "spread": {"amount": val, "percent": pct},
+        }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Fees:
     fixed: float
     variable: float
@@ -47,6 +66,34 @@ class Fees:
         return self.fixed_fee() + self.variable_fee()
 
 
+# Position specs are identified by a bitmask of which values were given:
+#   (prop << 3) | (rpt << 2) | (rp << 1) | p
+_INVALID_SPEC_MASKS = frozenset({0b0000, 0b0001, 0b0010, 0b0100, 0b0101, 0b1000})
+
+
+def _from_proportion_and_risk(
+    account_size: float, prop: float, rp: float
+) -> tuple[float, float, float, float]:
+    p = (prop * rp) / account_size
+    return prop, account_size * p, rp, p
+
+
+# Each handler takes (account_size, prop, rpt, rp, p) and calculates the missing values
+_SPEC_HANDLERS = {
+    #  prop, rpt, rp, p
+    0b0011: lambda a, prop, rpt, rp, p: ((a * p) / rp, a * p, rp, p),
+    0b0110: lambda a, prop, rpt, rp, p: (rpt / rp, rpt, rp, rpt / a),
+    0b0111: lambda a, prop, rpt, rp, p: (rpt / rp, rpt, rp, p),
+    0b1001: lambda a, prop, rpt, rp, p: (prop, a * p, (a * p) / prop, p),
+    0b1010: lambda a, prop, rpt, rp, p: _from_proportion_and_risk(a, prop, rp),
+    0b1011: lambda a, prop, rpt, rp, p: (prop, a * p, rp, p),
+    0b1100: lambda a, prop, rpt, rp, p: (prop, rpt, rpt / prop, rpt / a),
+    0b1101: lambda a, prop, rpt, rp, p: (prop, rpt, rpt / prop, p),
+    0b1110: lambda a, prop, rpt, rp, p: (prop, rpt, rp, rpt / a),
+    0b1111: lambda a, prop, rpt, rp, p: (prop, rpt, rp, p),
+}
+
+
 def check_position_spec(
     account_size: float,
     proportion: float | None = None,
@@ -61,51 +108,21 @@ def check_position_spec(
         risk_percentage,
         risk_per_trade_percent,
     )
-    spec = [prop, rpt, rp, p]
-    spec_config = tuple(map(bool, spec))
-    invalid_spec_configs = [
-        (False, False, False, False),
-        (False, False, False, True),
-        (False, False, True, False),
-        (False, True, False, False),
-        (False, True, False, True),
-        (True, False, False, False),
-    ]
-    if spec_config in invalid_spec_configs:
-        raise ValueError(f"Invalid position spec: {tuple(spec)}")
-    match spec_config:
-        #    ( prop , rpt , rp  , p   )
-        case (False, False, True, True):
-            prop = (account_size * p) / rp
-            rpt = account_size * p
-        case (False, True, True, False):
-            prop = rpt / rp
-            p = rpt / account_size
-        case (False, True, True, True):
-            prop = rpt / rp
-        case (True, False, False, True):
-            rpt = account_size * p
-            rp = (account_size * p) / prop
-        case (True, False, True, False):
-            p = (prop * rp) / account_size
-            rpt = account_size * p
-        case (True, False, True, True):
-            rpt = account_size * p
-        case (True, True, False, False):
-            rp = rpt / prop
-            p = rpt / account_size
-        case (True, True, False, True):
-            rp = rpt / prop
-        case (True, True, True, False):
-            p = rpt / account_size
-        case (True, True, True, True):
-            pass
-        case _:
-            raise ValueError(f"Unexpected position spec: {tuple(spec)} ({spec_config})")
-    return prop, rpt, rp, p
+    mask = (bool(prop) << 3) | (bool(rpt) << 2) | (bool(rp) << 1) | bool(p)
+    if mask in _INVALID_SPEC_MASKS:
+        raise ValueError(f"Invalid position spec: {(prop, rpt, rp, p)}")
+    return _SPEC_HANDLERS[mask](account_size, prop, rpt, rp, p)
 
 
 class Position:
+    __slots__ = (
+        "account_size",
+        "proportion",
+        "risk_per_trade",
+        "risk_percentage",
+        "risk_per_trade_percent",
+    )
+
     def __init__(
         self,
         account_size: float,
@@ -129,6 +146,19 @@ class Position:
 
 
 class LongPosition(Position):
+    __slots__ = (
+        "asset",
+        "opening_price",
+        "close_price",
+        "_fixed_fee",
+        "_variable_fee",
+        "_shares",
+        "_size",
+        "_stop_loss",
+        "_opening_costs",
+        "_closing_costs",
+    )
+
     def __init__(
         self,
         asset: Asset,
@@ -154,6 +184,25 @@ class LongPosition(Position):
         self._fixed_fee = fixed_fee
         self._variable_fee = variable_fee
         self.close_price: Price | None = None
+        # The values below only depend on the opening price and the position spec, which don't
+        # change once a position has been opened, so they're calculated once up front
+        # (e.g. ``to_dict`` needs the number of shares about ten times).
+        max_size = self.risk_per_trade / self.risk_percentage
+        self._shares = int(round(max_size / opening_price.ask))
+        self._size = self._shares * opening_price.ask
+        self._stop_loss = round(opening_price.ask * (1.0 - self.risk_percentage), 3)
+        self._opening_costs = self._costs(order_volume=self._size)
+        self._closing_costs: tuple[float, float, float] | None = None
+
+    @property
+    def fixed_fee(self) -> float:
+        """The fixed fee per order (opening / closing) of this position."""
+        return self._fixed_fee
+
+    @property
+    def variable_fee(self) -> float:
+        """The variable fee per order, as a fraction of the order volume."""
+        return self._variable_fee
 
     def is_open(self) -> bool:
         return self.close_price is None
@@ -163,11 +212,16 @@ class LongPosition(Position):
 
     def close(self, price: Price) -> Price:
         if self.has_been_closed():
-            print(
-                f"Position has already been closed: {self.close_price.bid:.2f} at {self.close_price.date_time.isoformat()}"
-            )
+            # Only format the message if it's going to be logged at all
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Position has already been closed: %.2f at %s",
+                    self.close_price.bid,
+                    self.close_price.date_time.isoformat(),
+                )
             return self.close_price
         self.close_price = price
+        self._closing_costs = self._costs(order_volume=self._shares * price.bid)
         return self.close_price
 
     def returns(self) -> tuple[float, float, float] | None:
@@ -180,7 +234,7 @@ class LongPosition(Position):
            If this position is still open, returns ``None``.
         """
         if self.is_open():
-            print("There are no returns yet because position is still open")
+            logger.debug("There are no returns yet because position is still open")
             return None
         gains_losses = (self.shares() * self.close_price.bid) - self.size()
         gains_losses_percent = gains_losses / self.size()
@@ -191,39 +245,34 @@ class LongPosition(Position):
             round(gains_losses_final, 3),
         )
 
+    def _costs(self, order_volume: float) -> tuple[float, float, float]:
+        # Same as ``Fees(...).fixed_fee(), .variable_fee(), .total()``, without creating a
+        # Fees object for every calculation
+        variable = order_volume * self._variable_fee
+        return self._fixed_fee, variable, self._fixed_fee + variable
+
     def shares(self) -> int:
-        max_size = self.risk_per_trade / self.risk_percentage
-        return int(round(max_size / self.opening_price.ask))
+        return self._shares
 
     def size(self) -> float:
-        return self.shares() * self.opening_price.ask
+        return self._size
 
     def stop_loss(self) -> float:
-        return round(self.opening_price.ask * (1.0 - self.risk_percentage), 3)
+        return self._stop_loss
 
     def opening_costs(self) -> tuple[float, float, float]:
         """
         Returns:
             Tuple representing fees: (fixed, variable, total)
         """
-        fees = Fees(
-            fixed=self._fixed_fee, variable=self._variable_fee, order_volume=self.size()
-        )
-        return fees.fixed_fee(), fees.variable_fee(), fees.total()
+        return self._opening_costs
 
     def closing_costs(self) -> tuple[float, float, float] | None:
         """
         Returns:
             Tuple representing fees: (fixed, variable, total), or ``None`` if position hasn't been closed yet.
         """
-        if self.is_open():
-            return None
-        fees = Fees(
-            fixed=self._fixed_fee,
-            variable=self._variable_fee,
-            order_volume=self.shares() * self.close_price.bid,
-        )
-        return fees.fixed_fee(), fees.variable_fee(), fees.total()
+        return self._closing_costs
 
     def total_cost(self) -> tuple[float, float, float]:
         of, ov, ot = self.opening_costs()
@@ -233,9 +282,13 @@ class LongPosition(Position):
         return of + cf, ov + cv, ot + ct
 
     def to_dict(self) -> dict:
+        of, ov, ot = self._opening_costs
+        total_costs = {"fixed": of, "variable": ov, "total": ot}
         if self.has_been_closed():
             closing_price = self.close_price.to_dict()
-            closing_costs = _costs_dict(self.closing_costs())
+            cf, cv, ct = self._closing_costs
+            closing_costs = {"fixed": cf, "variable": cv, "total": ct}
+            total_costs = {"fixed": of + cf, "variable": ov + cv, "total": ot + ct}
             status = "closed"
             net, net_pct, final = self.returns()
             returns = {"net": net, "net percent": net_pct, "final": final}
@@ -250,9 +303,9 @@ class LongPosition(Position):
             days_till_close = None
         costs = {
             "fees": {"fixed": self._fixed_fee, "variable": self._variable_fee},
-            "opening": _costs_dict(self.opening_costs()),
+            "opening": {"fixed": of, "variable": ov, "total": ot},
             "closing": closing_costs,
-            "total": _costs_dict(self.total_cost()),
+            "total": total_costs,
         }
         result = {
             "asset": self.asset.to_dict(),
@@ -274,10 +327,20 @@ class LongPosition(Position):
         }
         return result
 
-
-def _costs_dict(costs: tuple[float, float, float]) -> dict[str, float]:
-    fixed, variable, total = costs
-    return {"fixed": fixed, "variable": variable, "total": total}
+    def to_json(self) -> bytes:
+        """
+        Returns:
+            This position (see ``to_dict``) serialized as UTF-8 encoded JSON. Uses ``orjson`` if
+            it's installed (which is considerably faster), the standard library otherwise.
+        """
+        position = self.to_dict()
+        try:
+            import orjson
+        except ImportError:
+            return json.dumps(
+                position, ensure_ascii=False, separators=(",", ":")
+            ).encode()
+        return orjson.dumps(position)
 
 
 def print_position_info(position: Position):
@@ -2,7 +2,9 @@ import polars
 
 import indicatory.names as names
 
-from polars import DataFrame, Series, col, when
+from polars import DataFrame, Expr, col, when
+
+from indicatory.frames import Frame, collect_like, with_columns_fused
 
 
 def daily_returns(dataframe: DataFrame) -> DataFrame:
@@ -19,10 +21,7 @@ def daily_returns(dataframe: DataFrame) -> DataFrame:
         A new dataframe with added columns representing daily return and percentage change in price (use module
         ``indicatory.names`` for column names).
     """
-    return dataframe.with_columns(
-        (col(names.CLOSE) - col(names.OPEN)).alias(names.dret()),
-        (((col(names.CLOSE) / col(names.OPEN)) - 1.0) * 100.0).alias(names.dret_pct()),
-    )
+    return dataframe.with_columns(*_daily_returns())
 
 
 def daily_range(dataframe: DataFrame) -> DataFrame:
@@ -37,13 +36,43 @@ def daily_range(dataframe: DataFrame) -> DataFrame:
         DataFrame with added columns representing daily range and percentage change in price (use module
         ``indicatory.names`` for column names).
     """
-    return dataframe.with_columns(
-        (col(names.HIGH) - col(names.LOW)).alias(names.dran()),
-        (((col(names.HIGH) / col(names.LOW)) - 1.0) * 100.0).alias(names.dran_pct()),
-    )
+    return dataframe.with_columns(*_daily_range())
 
 
-def true_range(dataframe: DataFrame, round_to_decimals: int = 5) -> DataFrame:
+def daily_returns_and_range(dataframe: DataFrame) -> DataFrame:
+    """
+    Calculates both the daily returns (see ``daily_returns``) and the daily range (see ``daily_range``)
+    for a given dataframe of financial data ("OHLC").
+
+    Calling this function instead of ``daily_returns`` and ``daily_range`` one after another
+    calculates all four columns within a single pass.
+
+    Args:
+        dataframe: The input dataframe with financial data. It should contain at least the columns
+                   'Open', 'High', 'Low' and 'Close'.
+
+    Returns:
+        A new dataframe with added columns representing daily return, daily range and their percentage
+        changes in price (use module ``indicatory.names`` for column names).
+    """
+    return dataframe.with_columns(*_daily_returns(), *_daily_range())
+
+
+def _daily_returns() -> list[Expr]:
+    return [
+        (col(names.CLOSE) - col(names.OPEN)).alias(names.DRET),
+        (((col(names.CLOSE) / col(names.OPEN)) - 1.0) * 100.0).alias(names.DRET_PCT),
+    ]
+
+
+def _daily_range() -> list[Expr]:
+    return [
+        (col(names.HIGH) - col(names.LOW)).alias(names.DRAN),
+        (((col(names.HIGH) / col(names.LOW)) - 1.0) * 100.0).alias(names.DRAN_PCT),
+    ]
+
+
+def true_range(dataframe: Frame, round_to_decimals: int = 5) -> Frame:
     """
      Calculates the true range (TR) for a given dataframe of financial data.
 
@@ -51,75 +80,61 @@ def true_range(dataframe: DataFrame, round_to_decimals: int = 5) -> DataFrame:
      of current high less the previous close, and absolute value of current low less the previous close.
 
     Args:
-        dataframe: The input dataframe with financial data. It should contain at least three columns
-                   named 'High', 'Low' and 'Close', which represent the highest price, lowest price and closing price
-                   of the security respectively.
+        dataframe: The input dataframe (eager or lazy) with financial data. It should contain at least three
+                   columns named 'High', 'Low' and 'Close', which represent the highest price, lowest price
+                   and closing price of the security respectively.
         round_to_decimals: Number of decimal places to which the true range values will be rounded. Defaults to 5.
 
     Returns:
         DataFrame with an added column representing true range ('TR').
     """
-    prev_close = "Previous Close"
-    return (
-        dataframe.with_columns(col.Close.shift(1).alias(prev_close))
-        .with_columns(
-            when(col(prev_close).is_null())
-            .then(col.High - col.Low)
-            .otherwise(
-                polars.max_horizontal(
-                    col.High - col.Low,
-                    abs(col.High - col(prev_close)),
-                    abs(col.Low - col(prev_close)),
-                )
-            )
-            .round(round_to_decimals)
-            .alias(names.tr())
-        )
-        .drop(prev_close)
-    )
+    return with_columns_fused(dataframe, _true_range(round_to_decimals))
 
 
-def _calculate_current_average_true_range(
-    previous_avg_true_range: float, current_true_range: float, window_size: int
-) -> float:
+def _true_range(round_to_decimals: int) -> Expr:
+    # No intermediate 'Previous Close' column needed: the shifted close is used inline. For the
+    # first row, there is no previous close, so `max_horizontal` (which ignores nulls) only
+    # takes "high - low" into account.
+    prev_close = col.Close.shift(1)
     return (
-        previous_avg_true_range * (window_size - 1) + current_true_range
-    ) / window_size
+        polars.max_horizontal(
+            col.High - col.Low,
+            (col.High - prev_close).abs(),
+            (col.Low - prev_close).abs(),
+        )
+        .round(round_to_decimals)
+        .alias(names.TR)
+    )
 
 
-def _calculate_average_true_ranges(
-    true_ranges: Series, window_size: int, round_to_decimals: int = 5
-) -> Series:
+def _average_true_range(window_size: int) -> Expr:
     # https://en.wikipedia.org/wiki/Average_true_range#Calculation
-    atr = []
-    for i in range(true_ranges.count()):
-        if i < window_size:
-            atr.append(None)
-        elif i == window_size:
-            # The initial ATR is just mean(TR) of the first "window_size" number of items
-            atr.append(true_ranges[:window_size].mean())
-        else:
-            # After that, the ATR is calculated as:
-            #  ATR(cur) = (prev_ATR * (window_size - 1) + cur_TR) / window_size
-            current_atr = _calculate_current_average_true_range(
-                previous_avg_true_range=atr[i - 1],
-                current_true_range=true_ranges[i],
-                window_size=window_size,
-            )
-            atr.append(current_atr)
-    return Series(atr).round(round_to_decimals)
+    # The initial ATR (after "window_size" rows) is just mean(TR) of the first "window_size"
+    # number of items. After that, the ATR is calculated as:
+    #  ATR(cur) = (prev_ATR * (window_size - 1) + cur_TR) / window_size
+    #           = (1 - 1/window_size) * prev_ATR + (1/window_size) * cur_TR
+    # which is an exponential moving average with alpha = 1/window_size, seeded with the initial ATR.
+    row = polars.int_range(0, polars.len())
+    seeded = (
+        when(row < window_size)
+        .then(None)
+        .when(row == window_size)
+        .then(col(names.TR).shift(1).rolling_mean(window_size=window_size))
+        .otherwise(col(names.TR))
+    )
+    return seeded.ewm_mean(alpha=1.0 / window_size, adjust=False, ignore_nulls=True)
 
 
 def average_true_range(
-    dataframe: DataFrame, window_size: int = 10, round_to_decimals: int = 5
-) -> DataFrame:
+    dataframe: Frame, window_size: int = 10, round_to_decimals: int = 5
+) -> Frame:
     """
     Calculates the Average True Range (ATR) and its percentage change over the closing price
     for a given dataframe of financial data.
 
     Args:
-        dataframe: The input dataframe with financial data. It should contain at least three columns
-                   named 'Close', 'High' and 'Low', which represent the closing price, highest price
+        dataframe: The input dataframe (eager or lazy) with financial data. It should contain at least three
+                   columns named 'Close', 'High' and 'Low', which represent the closing price, highest price
                    and lowest price of the security respectively.
         window_size: Size of the rolling window used for calculating the ATR. Defaults to 10.
         round_to_decimals: Number of decimal places to which the ATR values will be rounded. Defaults to 5.
@@ -128,15 +143,14 @@ def average_true_range(
         DataFrame with added columns representing average true range and percentage change in price (use module
        ``indicatory.names`` for column names).
     """
-    dataframe_with_tr = true_range(dataframe=dataframe)
-    return dataframe_with_tr.with_columns(
-        _calculate_average_true_ranges(
-            true_ranges=dataframe_with_tr[names.tr()],
-            window_size=window_size,
-            round_to_decimals=round_to_decimals,
-        ).alias(names.atr(window_size=window_size))
-    ).with_columns(
-        ((col(names.atr(window_size)) / col.Close) * 100.0).alias(
-            names.atr_pct(window_size)
-        )
+    atr = _average_true_range(window_size).round(round_to_decimals)
+    # True range, ATR and ATR (%) are calculated within one (lazy) query
+    return collect_like(
+        dataframe,
+        dataframe.lazy()
+        .with_columns(_true_range(round_to_decimals=5))
+        .with_columns(
+            atr.alias(names.atr(window_size)),
+            ((atr / col.Close) * 100.0).alias(names.atr_pct(window_size)),
+        ),
     )
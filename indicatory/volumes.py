@@ -1,10 +1,8 @@
 import indicatory.names as names
 
-from polars import DataFrame, col, when, cum_sum
+from polars import DataFrame, col
 
-
-PREV_CLOSE_COL = "Previous Close"
-OBV_DIFF_COL = "OBV Diff"
+from indicatory.frames import with_columns_fused
 
 
 def on_balance_volume(dataframe: DataFrame) -> DataFrame:
@@ -18,22 +16,12 @@ def on_balance_volume(dataframe: DataFrame) -> DataFrame:
     Returns:
         DataFrame with added column "OBV" representing the on-balance-volume.
     """
-    close_volume = dataframe.select(
-        col(names.DATE, names.CLOSE, names.VOLUME)
-    ).with_columns(col(names.CLOSE).shift(1).alias(PREV_CLOSE_COL))
-    close_volume_factors = close_volume.with_columns(
-        when(col(names.CLOSE) > col(PREV_CLOSE_COL))
-        .then(col(names.VOLUME))
-        .when(col(names.CLOSE) < col(PREV_CLOSE_COL))
-        .then(-1 * col(names.VOLUME))
-        .otherwise(0)
-        .alias(OBV_DIFF_COL)
-    )
-    close_volume_obv = close_volume_factors.with_columns(
-        cum_sum(OBV_DIFF_COL).alias(names.obv())
-    )
-    return dataframe.with_columns(
-        close_volume_obv.select(col(names.obv())).to_series().alias(names.obv())
+    # The daily OBV change is the volume, signed by the direction of the close price's change
+    # (and zero if it didn't change). Calculating it via `sign` evaluates one comparison per
+    # row instead of two, and the cumulative sum runs in the same expression.
+    obv_diff = col(names.CLOSE).diff().sign() * col(names.VOLUME)
+    return with_columns_fused(
+        dataframe, obv_diff.fill_null(0).cum_sum().alias(names.OBV)
     )
 
 
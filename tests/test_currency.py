@@ -28,3 +28,68 @@ def test_relative_currency_strength():
     result = relative_currency_strength(dataframe=asset, currency_data=currency)
     assert tuple(result[names.rcs_open()]) == (2.0, 4.0, 6.0, 8.0)
     assert tuple(result[names.rcs_close()]) == (3.0, 2.0, 1.0, 1.0)
+
+
+def test_relative_currency_strength_with_missing_currency_dates():
+    asset = DataFrame(
+        {
+            names.DATE: [date(2024, 8, 5), date(2024, 8, 6), date(2024, 8, 7)],
+            names.OPEN: [2.0, 4.0, 6.0],
+            names.CLOSE: [3.0, 6.0, 9.0],
+        }
+    )
+    # No currency data for 2024-08-06, so the previous day's prices are used
+    currency = DataFrame(
+        {
+            names.DATE: [date(2024, 8, 4), date(2024, 8, 5), date(2024, 8, 7)],
+            names.OPEN: [0.1, 1.0, 2.0],
+            names.CLOSE: [0.1, 3.0, 3.0],
+        }
+    )
+    result = relative_currency_strength(dataframe=asset, currency_data=currency)
+    assert tuple(result[names.rcs_open()]) == (2.0, 4.0, 3.0)
+    assert tuple(result[names.rcs_close()]) == (1.0, 2.0, 3.0)
+    assert result.columns == asset.columns + [names.rcs_open(), names.rcs_close()]
+
+
+def test_relative_currency_strength_with_unsorted_dates():
+    asset = DataFrame(
+        {
+            names.DATE: [date(2024, 8, 3), date(2024, 8, 1), date(2024, 8, 2)],
+            names.OPEN: [3.0, 1.0, 2.0],
+            names.CLOSE: [6.0, 2.0, 4.0],
+        }
+    )
+    currency = DataFrame(
+        {
+            names.DATE: [date(2024, 8, 2), date(2024, 8, 3), date(2024, 8, 1)],
+            names.OPEN: [2.0, 3.0, 1.0],
+            names.CLOSE: [2.0, 3.0, 1.0],
+        }
+    )
+    result = relative_currency_strength(dataframe=asset, currency_data=currency)
+    assert tuple(result[names.DATE]) == tuple(asset[names.DATE])
+    assert tuple(result[names.rcs_open()]) == (1.0, 1.0, 1.0)
+    assert tuple(result[names.rcs_close()]) == (2.0, 2.0, 2.0)
+    assert result.columns == asset.columns + [names.rcs_open(), names.rcs_close()]
+
+
+def test_relative_currency_strength_with_row_index_column():
+    asset = DataFrame(
+        {
+            names.DATE: [date(2024, 8, 2), date(2024, 8, 1)],
+            names.OPEN: [4.0, 2.0],
+            names.CLOSE: [6.0, 3.0],
+        }
+    ).with_row_index("Row Index")
+    currency = DataFrame(
+        {
+            names.DATE: [date(2024, 8, 1), date(2024, 8, 2)],
+            names.OPEN: [2.0, 4.0],
+            names.CLOSE: [3.0, 6.0],
+        }
+    )
+    result = relative_currency_strength(dataframe=asset, currency_data=currency)
+    assert result.columns == asset.columns + [names.rcs_open(), names.rcs_close()]
+    assert tuple(result["Row Index"]) == (0, 1)
+    assert tuple(result[names.rcs_open()]) == (1.0, 1.0)
@@ -1,7 +1,8 @@
 import indicatory.names as names
 
-from polars import DataFrame
+from polars import DataFrame, LazyFrame
 from indicatory.deviations import (
+    MAX_SHIFTED_WINDOW_SIZE,
     standard_deviation,
     standard_deviation_bands,
     mean_absolute_deviation,
@@ -46,3 +47,33 @@ def test_average_absolute_deviation_bands():
     upper_expected = (None, 2.5, 5.0, 11.5)
     assert tuple(result[names.aad_lower("A", 2)]) == lower_expected
     assert tuple(result[names.aad_upper("A", 2)]) == upper_expected
+
+
+def test_deviation_bands_with_lazy_frame():
+    result = standard_deviation_bands(TEST_DATA.lazy(), window_size=2, column_name="A")
+    assert isinstance(result, LazyFrame)
+    assert result.collect().equals(
+        standard_deviation_bands(TEST_DATA, window_size=2, column_name="A")
+    )
+
+
+def test_average_absolute_deviation_with_large_window():
+    # Windows larger than MAX_SHIFTED_WINDOW_SIZE are aggregated via rolling groups
+    data = DataFrame({"A": [float((i * 7) % 11) for i in range(100)]})
+    window_size = MAX_SHIFTED_WINDOW_SIZE + 8
+    result = average_absolute_deviation(data, window_size=window_size, column_name="A")
+    expected = data["A"].rolling_map(mean_absolute_deviation, window_size=window_size)
+    assert result.columns == ["A", names.aad("A", window_size)]
+    assert result[names.aad("A", window_size)].null_count() == window_size - 1
+    assert (result[names.aad("A", window_size)] - expected).abs().max() < 1e-12
+
+
+def test_average_absolute_deviation_with_row_index_column():
+    data = TEST_DATA.with_row_index("Row Index")
+    for window_size in (2, MAX_SHIFTED_WINDOW_SIZE + 1):
+        result = average_absolute_deviation(
+            data, window_size=window_size, column_name="A"
+        )
+        assert result.columns == ["Row Index", "A", names.aad("A", window_size)]
+    result = average_absolute_deviation(data, window_size=2, column_name="A")
+    assert tuple(result[names.aad("A", 2)]) == AVG_ABS_DEVIATIONS
@@ -1,10 +1,13 @@
+import pytest
 import indicatory.names as names
 
-from polars import DataFrame
+from polars import DataFrame, Float32
 
 from indicatory.means_medians import (
     simple_moving_average,
     simple_moving_averages,
+    IncrementalSimpleMovingAverage,
+    moving_average_convergence_divergence,
     moving_median,
 )
 
@@ -44,6 +47,59 @@ def test_simple_moving_averages():
     )
 
 
+def test_simple_moving_averages_with_duplicates():
+    test_data = DataFrame({"A": [1.0, 2.0, 3.0], "B": [2.0, 4.0, 6.0]})
+    result = simple_moving_averages(
+        dataframe=test_data, window_sizes=[2, 2], column_names=["A", "B", "A"]
+    )
+    assert result.columns == ["A", "B", names.sma("A", 2), names.sma("B", 2)]
+    assert tuple(result[names.sma("B", 2)]) == (None, 3.0, 5.0)
+
+
+def test_simple_moving_average_with_dtype():
+    test_data = DataFrame({"A": [1.0, 2.0, 4.0]})
+    result = simple_moving_average(
+        test_data, column_name="A", window_size=2, dtype=Float32
+    )
+    assert result[names.sma("A", 2)].dtype == Float32
+    assert tuple(result[names.sma("A", 2)]) == (None, 1.5, 3.0)
+
+
+def test_incremental_simple_moving_average():
+    test_data = DataFrame({"A": [1.0, 2.0, 2.0, 3.0, 4.0, 6.0, 5.0]})
+    sma_column_name = names.sma("A", 3)
+    incremental_sma = IncrementalSimpleMovingAverage(column_name="A", window_size=3)
+    for rows in (1, 2, 4, 4, 7):
+        result = incremental_sma.update(test_data.head(rows))
+        expected = simple_moving_average(
+            test_data.head(rows), column_name="A", window_size=3
+        )
+        assert tuple(result[sma_column_name]) == tuple(expected[sma_column_name])
+    with pytest.raises(ValueError):
+        incremental_sma.update(test_data.head(5))
+
+
+def test_incremental_simple_moving_average_with_changed_rows():
+    test_data = DataFrame({"A": [1.0, 2.0, None, 3.0, 4.0]})
+    incremental_sma = IncrementalSimpleMovingAverage(column_name="A", window_size=3)
+    incremental_sma.update(test_data.head(4))
+    incremental_sma.update(test_data)
+    changed = DataFrame({"A": [1.0, 2.0, None, 9.0, 4.0, 5.0]})
+    with pytest.raises(ValueError):
+        incremental_sma.update(changed)
+
+
+def test_incremental_simple_moving_average_merges_chunks():
+    test_data = DataFrame({"A": [float(i % 7) for i in range(200)]})
+    sma_column_name = names.sma("A", 3)
+    incremental_sma = IncrementalSimpleMovingAverage(column_name="A", window_size=3)
+    for rows in range(1, 201):
+        result = incremental_sma.update(test_data.head(rows))
+    assert result[sma_column_name].n_chunks() <= incremental_sma.MAX_CHUNKS
+    expected = simple_moving_average(test_data, column_name="A", window_size=3)
+    assert tuple(result[sma_column_name]) == tuple(expected[sma_column_name])
+
+
 def test_moving_median():
     test_data = DataFrame({"A": [1.0, 2.0, 2.0, 3.0, 4.0]})
     result_1 = moving_median(test_data, window_size=3, column_name="A")[
@@ -54,3 +110,11 @@ def test_moving_median():
     ]
     assert tuple(result_1) == (None, None, 2.0, 2.0, 3.0)
     assert tuple(result_2) == (None, None, None, 2.0, 2.5)
+
+
+def test_moving_average_convergence_divergence():
+    test_data = DataFrame({names.CLOSE: [1.0, 2.0, 4.0, 8.0, 16.0]})
+    result = moving_average_convergence_divergence(test_data, short=1, long=2, signal=2)
+    assert tuple(result[names.macd(1, 2)]) == (None, 0.5, 1.0, 2.0, 4.0)
+    assert tuple(result[names.macd_sig(2)]) == (None, None, 0.75, 1.5, 3.0)
+    assert tuple(result[names.macd_hist(2)]) == (None, None, 0.25, 0.5, 1.0)
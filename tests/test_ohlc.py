@@ -1,7 +1,7 @@
 import indicatory.names as names
 
 from polars import DataFrame
-from indicatory.ohlc import average_price
+from indicatory.ohlc import average_price, naive_heikin_ashi
 from datetime import datetime
 
 OHLC_TEST_DATES = [
@@ -32,3 +32,31 @@ def test_mean_pricing():
     ]
     result = average_price(OHLC_TEST_DATAFRAME)[names.avg_price()]
     assert tuple(result) == tuple(expected_mean_prices)
+
+
+def test_heikin_ashi():
+    # Reversed input must not matter since Heikin-Ashi candles are calculated by date
+    result = naive_heikin_ashi(OHLC_TEST_DATAFRAME.reverse())
+    assert tuple(result[names.DATE]) == tuple(OHLC_TEST_DATES)
+    assert tuple(result[names.HA_OPEN]) == (
+        58.2,
+        58.13125,
+        57.52312500000001,
+        56.93781250000001,
+        56.02015625000001,
+    )
+    assert tuple(result[names.HA_HIGH]) == (
+        58.82,
+        58.13125,
+        57.52312500000001,
+        56.93781250000001,
+        56.02015625000001,
+    )
+    assert tuple(result[names.HA_LOW]) == (57.03, 56.21, 55.35, 54.17, 52.32)
+    assert tuple(result[names.HA_CLOSE]) == (
+        58.0625,
+        56.915000000000006,
+        56.3525,
+        55.102500000000006,
+        53.99249999999999,
+    )
@@ -1,4 +1,6 @@
-from polars import DataFrame
+import indicatory.names as names
+
+from polars import DataFrame, LazyFrame
 from indicatory.oscillators import (
     _moving_gains_and_losses,
     _simple_moving_average_gains_and_losses,
@@ -7,7 +9,9 @@ from indicatory.oscillators import (
     simple_relative_strength_index,
     detrended_price_oscillator,
     rate_of_change,
+    stochastic_oscillator,
     column_difference,
+    percentage_price_oscillator,
 )
 
 
@@ -32,8 +36,8 @@ def test_gains_and_losses():
         None,
         None,
         0.3333333333333333,
-        0.38888888888888884,
-        0.25925925925925924,
+        0.3888888888888889,
+        0.2592592592592593,
     )
     assert tuple(result["EMA 3 Losses"]) == (None, None, 0.0, 0.0, 0.6666666666666666)
 
@@ -44,7 +48,8 @@ def test_relative_strength_indices():
     # Simple RSI (aka "Cutler's RSI")
     result = simple_relative_strength_index(test_data, window_size=3)
     assert tuple(result["RS 3"]) == (0.0, 0.0, 1.0, 1.5, 1.5, 0.0, 0.0, 0.25)
-    assert tuple(result["RSI 3"]) == (0.0, 0.0, 50.0, 60.0, 60.0, 0.0, 0.0, 20.0)
+    # No losses within the windows ending at rows 5 and 6, so RSI is 100
+    assert tuple(result["RSI 3"]) == (0.0, 0.0, 50.0, 60.0, 60.0, 100.0, 100.0, 20.0)
 
     # "Classic" RSI
     result = relative_strength_index(test_data, window_size=3)
@@ -52,11 +57,11 @@ def test_relative_strength_indices():
         0.0,
         0.0,
         1.0,
-        1.7499999999999998,
-        4.0,
-        4.0,
-        6.531250000000001,
-        0.40347490347490356,
+        1.75,
+        3.999999999999999,
+        3.9999999999999996,
+        6.531249999999999,
+        0.4034749034749036,
     )
     assert tuple(result["RSI 3"]) == (
         0.0,
@@ -66,8 +71,66 @@ def test_relative_strength_indices():
         80.0,
         80.0,
         86.72199170124482,
-        28.748280605226952,
+        28.748280605226967,
+    )
+
+
+def test_relative_strength_index_with_lazy_frame():
+    test_data = DataFrame({"Close": [0.5, 1.5, 0.5, 1.0, 2.0, 2.0, 2.5, 0.5]})
+    result = relative_strength_index(test_data.lazy(), window_size=3)
+    assert isinstance(result, LazyFrame)
+    assert result.collect().equals(relative_strength_index(test_data, window_size=3))
+
+
+def test_percentage_price_oscillator():
+    test_data = DataFrame({"Close": [1.0, 2.0, 3.0, 4.0, 6.0]})
+    result = percentage_price_oscillator(
+        test_data, short_window_size=2, long_window_size=3
+    )
+    assert result.columns == ["Close", "PPO 2/3 Close"]
+    assert tuple(result["PPO 2/3 Close"]) == (
+        None,
+        None,
+        25.0,
+        16.666666666666664,
+        15.384615384615394,
+    )
+
+
+def test_relative_strength_indices_without_losses():
+    # Steadily rising prices have no losses, i.e. an infinite RS and an RSI of 100
+    test_data = DataFrame({"Close": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]})
+    for rsi in (simple_relative_strength_index, relative_strength_index):
+        result = rsi(test_data, window_size=3)
+        assert tuple(result["RSI 3"]) == (0.0, 0.0, 100.0, 100.0, 100.0, 100.0)
+
+
+def test_stochastic_oscillator():
+    test_data = DataFrame(
+        {
+            "High": [2.0, 4.0, 6.0, 8.0],
+            "Low": [0.0, 2.0, 4.0, 6.0],
+            "Close": [1.0, 3.0, 5.0, 8.0],
+        }
+    )
+    result = stochastic_oscillator(test_data, window_size=2)
+    assert tuple(result["Fast %K 2"]) == (None, 75.0, 75.0, 100.0)
+    assert tuple(result["Fast %D 2"]) == (None, None, 75.0, 87.5)
+    assert tuple(result["Slow %K 2"]) == (None, None, 75.0, 87.5)
+    assert tuple(result["Slow %D 2"]) == (None, None, None, 81.25)
+
+
+def test_stochastic_oscillator_with_flat_window():
+    test_data = DataFrame(
+        {
+            "High": [2.0, 2.0, 6.0, 8.0],
+            "Low": [2.0, 2.0, 4.0, 6.0],
+            "Close": [2.0, 2.0, 5.0, 8.0],
+        }
     )
+    result = stochastic_oscillator(test_data, window_size=2)
+    assert tuple(result["Fast %K 2"]) == (None, 0.0, 75.0, 100.0)
+    assert tuple(result["Fast %D 2"]) == (None, None, 37.5, 87.5)
 
 
 def test_detrended_price_oscillator():
@@ -79,7 +142,8 @@ def test_detrended_price_oscillator():
 def test_rate_of_change():
     test_data = DataFrame({"A": [1.0, 2.0, 3.0, 5.0]})
     result = rate_of_change(dataframe=test_data, column="A")
-    assert tuple(result["dA"]) == (None, 1.0, 1.0, 2.0)
+    assert result.columns == ["A", names.roc("A")]
+    assert tuple(result[names.roc("A")]) == (None, 1.0, 1.0, 2.0)
 
 
 def test_column_difference():
@@ -0,0 +1,60 @@
+import indicatory.names as names
+
+from polars import DataFrame
+from indicatory.deviations import (
+    MAX_SHIFTED_WINDOW_SIZE,
+    average_absolute_deviation,
+    standard_deviation,
+    variance,
+)
+from indicatory.means_medians import (
+    moving_average_convergence_divergence,
+    moving_median,
+    simple_moving_averages,
+)
+from indicatory.packs import indicator_pack
+
+TEST_DATA = DataFrame({names.CLOSE: [1.0, 2.0, 4.0, 9.0, 7.0, 3.0, 5.0, 6.0]})
+
+
+def test_indicator_pack():
+    result = indicator_pack(
+        TEST_DATA,
+        sma_windows=(2, 3),
+        sd_windows=(3,),
+        var_windows=(3,),
+        aad_windows=(2,),
+        mm_windows=(4,),
+        macd=(2, 3, 2),
+    )
+    expected = simple_moving_averages(TEST_DATA, window_sizes=[2, 3])
+    expected = standard_deviation(expected, window_size=3)
+    expected = variance(expected, window_size=3)
+    expected = average_absolute_deviation(expected, window_size=2)
+    expected = moving_median(expected, window_size=4)
+    expected = moving_average_convergence_divergence(
+        expected, short=2, long=3, signal=2
+    )
+    assert result.columns == expected.columns
+    assert result.equals(expected)
+
+
+def test_indicator_pack_without_indicators():
+    assert indicator_pack(TEST_DATA).equals(TEST_DATA)
+
+
+def test_indicator_pack_with_row_index_column():
+    data = TEST_DATA.with_row_index("Row Index")
+    result = indicator_pack(data, sma_windows=(2,), aad_windows=(2,))
+    assert result.columns == [
+        "Row Index",
+        names.CLOSE,
+        names.sma(names.CLOSE, 2),
+        names.aad(names.CLOSE, 2),
+    ]
+    result = indicator_pack(data, aad_windows=(MAX_SHIFTED_WINDOW_SIZE + 1,))
+    assert result.columns == [
+        "Row Index",
+        names.CLOSE,
+        names.aad(names.CLOSE, MAX_SHIFTED_WINDOW_SIZE + 1),
+    ]
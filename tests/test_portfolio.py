@@ -0,0 +1,116 @@
+import indicatory.portfolio as portfolio
+
+from datetime import datetime
+from polars import DataFrame, Float64, Int64, col
+from indicatory.position import Asset, Price, open_long
+
+
+def test_long_positions():
+    open_position = open_long(
+        account_size=50_000,
+        asset=Asset(symbol="ABC", exchange="XYZ"),
+        price=Price(bid=99.0, ask=100.0, date_time=datetime(2024, 1, 1)),
+        risk_percentage=0.08,
+        risk_per_trade=500.0,
+        fixed_fee=1.0,
+        variable_fee=0.01,
+    )
+    closed_position = open_long(
+        account_size=20_000,
+        asset=Asset(symbol="DEF", exchange="XYZ"),
+        price=Price(bid=41.0, ask=41.3, date_time=datetime(2024, 1, 1)),
+        risk_percentage=0.1,
+        risk_per_trade=200.0,
+        fixed_fee=1.5,
+    )
+    closed_position.close(Price(bid=38.2, ask=38.4, date_time=datetime(2024, 2, 1)))
+
+    result = portfolio.long_positions(
+        portfolio.positions_frame([open_position, closed_position])
+    )
+    for position, row in zip(
+        [open_position, closed_position], result.iter_rows(named=True)
+    ):
+        assert row[portfolio.SYMBOL] == position.asset.symbol
+        assert row[portfolio.SHARES] == position.shares()
+        assert row[portfolio.SIZE] == position.size()
+        assert row[portfolio.STOP_LOSS] == position.stop_loss()
+        assert row[portfolio.OPENING_COSTS] == position.opening_costs()[2]
+    assert result[portfolio.CLOSING_COSTS][0] is None
+    assert result[portfolio.NET_RETURNS][0] is None
+    assert result[portfolio.CLOSING_COSTS][1] == closed_position.closing_costs()[2]
+    assert (
+        result[portfolio.NET_RETURNS][1],
+        result[portfolio.NET_RETURNS_PCT][1],
+        result[portfolio.FINAL_RETURNS][1],
+    ) == closed_position.returns()
+
+
+def test_price_spreads():
+    prices = [
+        Price(bid=99.0, ask=100.0, date_time=datetime(2024, 1, 1)),
+        Price(bid=41.0, ask=41.3, date_time=datetime(2024, 1, 2)),
+        Price(bid=38.2, ask=38.2, date_time=datetime(2024, 1, 3)),
+    ]
+    result = portfolio.price_spreads(portfolio.prices_frame(prices))
+    assert tuple(
+        zip(result[portfolio.SPREAD], result[portfolio.SPREAD_PERCENT])
+    ) == tuple(price.spread() for price in prices)
+
+
+def test_price_spreads_without_prices():
+    result = portfolio.price_spreads(portfolio.prices_frame([]))
+    assert result.is_empty()
+    assert result[portfolio.SPREAD].dtype == Float64
+    assert result[portfolio.SPREAD_PERCENT].dtype == Float64
+
+
+def test_price_spreads_with_integer_prices():
+    prices = [Price(bid=1, ask=2, date_time=datetime(2024, 1, 1))]
+    result = portfolio.price_spreads(portfolio.prices_frame(prices))
+    assert tuple(
+        zip(result[portfolio.SPREAD], result[portfolio.SPREAD_PERCENT])
+    ) == tuple(price.spread() for price in prices)
+
+
+def test_long_positions_with_integer_prices():
+    position = open_long(
+        account_size=1_000,
+        asset=Asset(symbol="ABC", exchange="XYZ"),
+        price=Price(bid=1.5, ask=2, date_time=datetime(2024, 1, 1)),
+        risk_percentage=0.1,
+        risk_per_trade=10,
+    )
+    position.close(Price(bid=3, ask=4, date_time=datetime(2024, 2, 1)))
+    result = portfolio.long_positions(portfolio.positions_frame([position]))
+    assert result[portfolio.OPENING_ASK].dtype == Float64
+    assert tuple(result[portfolio.SHARES]) == (position.shares(),) == (50,)
+    assert tuple(result[portfolio.STOP_LOSS]) == (position.stop_loss(),) == (1.8,)
+    assert tuple(result[portfolio.NET_RETURNS]) == (position.returns()[0],)
+
+
+def test_long_positions_without_positions():
+    result = portfolio.long_positions(portfolio.positions_frame([]))
+    assert result.is_empty()
+    assert result[portfolio.SHARES].dtype == Int64
+    assert result[portfolio.NET_RETURNS].dtype == Float64
+
+
+def test_long_positions_all_open():
+    position = open_long(
+        account_size=50_000,
+        asset=Asset(symbol="ABC", exchange="XYZ"),
+        price=Price(bid=99.0, ask=100.0, date_time=datetime(2024, 1, 1)),
+        risk_percentage=0.08,
+        risk_per_trade=500.0,
+    )
+    result = portfolio.long_positions(portfolio.positions_frame([position, position]))
+    assert tuple(result[portfolio.SHARES]) == (62, 62)
+    assert tuple(result[portfolio.CLOSING_COSTS]) == (None, None)
+    assert tuple(result[portfolio.FINAL_RETURNS]) == (None, None)
+
+
+def test_round_half_to_even():
+    values = [-3.5, -2.5, -1.5, -0.5, 0.5, 1.5, 2.5, -2.6, 2.4]
+    result = DataFrame({"A": values}).select(portfolio._round_half_to_even(col("A")))
+    assert tuple(result["A"]) == tuple(float(round(value)) for value in values)
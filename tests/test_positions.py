@@ -1,6 +1,8 @@
+import json
 import pytest
 
-from indicatory.position import Position, check_position_spec
+from datetime import datetime
+from indicatory.position import Asset, Price, check_position_spec, open_long
 
 
 ACCOUNT_SIZE = 50_000
@@ -10,52 +12,98 @@ RISK_PERCENTAGE = 0.08
 RISK_PER_TRADE_PERCENT = 0.01
 
 
-@pytest.mark.parametrize(
-    "prop, rpt, rp, p, error",
-    [
-        (False, False, False, False, ValueError),
-        (False, False, False, True, ValueError),
-        (False, False, True, False, ValueError),
-        (False, False, True, True, None),
-        (False, True, False, False, ValueError),
-        (False, True, False, True, ValueError),
-        (False, True, True, False, None),
-        (False, True, True, True, None),
-        (True, False, False, False, ValueError),
-        (True, False, False, True, None),
-        (True, False, True, False, None),
-        (True, False, True, True, None),
-        (True, True, False, False, None),
-        (True, True, False, True, None),
-        (True, True, True, False, None),
-        (True, True, True, True, None),
-    ],
-)
-def test_position_spec(prop, rpt, rp, p, error):
-    prop = PROPOSITION if prop else None
-    rpt = RISK_PER_TRADE if rpt else None
-    rp = RISK_PERCENTAGE if rp else None
-    p = RISK_PER_TRADE_PERCENT if p else None
-    if error is not None:
-        with pytest.raises(error):
-            check_position_spec(
-                account_size=ACCOUNT_SIZE,
-                proportion=prop,
-                risk_per_trade=rpt,
-                risk_percentage=rp,
-                risk_per_trade_percent=p,
-            )
-    else:
-        result = check_position_spec(
-            account_size=ACCOUNT_SIZE,
-            proportion=prop,
-            risk_per_trade=rpt,
-            risk_percentage=rp,
-            risk_per_trade_percent=p,
-        )
-        assert result == (
-            PROPOSITION,
-            RISK_PER_TRADE,
-            RISK_PERCENTAGE,
-            RISK_PER_TRADE_PERCENT,
-        )
+# Position specs as (prop, rpt, rp, p), i.e. which of the values are given
+INVALID_SPECS = [
+    (False, False, False, False),
+    (False, False, False, True),
+    (False, False, True, False),
+    (False, True, False, False),
+    (False, True, False, True),
+    (True, False, False, False),
+]
+VALID_SPECS = [
+    (False, False, True, True),
+    (False, True, True, False),
+    (False, True, True, True),
+    (True, False, False, True),
+    (True, False, True, False),
+    (True, False, True, True),
+    (True, True, False, False),
+    (True, True, False, True),
+    (True, True, True, False),
+    (True, True, True, True),
+]
+
+
+def _spec_id(spec: tuple[bool, bool, bool, bool]) -> str:
+    return "".join("1" if given else "0" for given in spec)
+
+
+def _check_spec(prop: bool, rpt: bool, rp: bool, p: bool):
+    return check_position_spec(
+        account_size=ACCOUNT_SIZE,
+        proportion=PROPOSITION if prop else None,
+        risk_per_trade=RISK_PER_TRADE if rpt else None,
+        risk_percentage=RISK_PERCENTAGE if rp else None,
+        risk_per_trade_percent=RISK_PER_TRADE_PERCENT if p else None,
+    )
+
+
+@pytest.mark.parametrize("spec", INVALID_SPECS, ids=_spec_id)
+def test_invalid_position_spec(spec):
+    with pytest.raises(ValueError):
+        _check_spec(*spec)
+
+
+@pytest.mark.parametrize("spec", VALID_SPECS, ids=_spec_id)
+def test_position_spec(spec):
+    assert _check_spec(*spec) == (
+        PROPOSITION,
+        RISK_PER_TRADE,
+        RISK_PERCENTAGE,
+        RISK_PER_TRADE_PERCENT,
+    )
+
+
+def test_long_position_costs():
+    position = open_long(
+        account_size=ACCOUNT_SIZE,
+        asset=Asset(symbol="ABC", exchange="XYZ"),
+        price=Price(bid=99.0, ask=100.0, date_time=datetime(2024, 1, 1)),
+        risk_percentage=RISK_PERCENTAGE,
+        risk_per_trade=RISK_PER_TRADE,
+        fixed_fee=1.0,
+        variable_fee=0.01,
+    )
+    assert position.fixed_fee == 1.0
+    assert position.variable_fee == 0.01
+    assert position.shares() == 62
+    assert position.size() == 6200.0
+    assert position.opening_costs() == (1.0, 62.0, 63.0)
+    assert position.closing_costs() is None
+    position.close(Price(bid=110.0, ask=111.0, date_time=datetime(2024, 2, 1)))
+    assert position.closing_costs() == (1.0, 68.2, 69.2)
+    assert position.total_cost() == (2.0, 130.2, 132.2)
+    assert json.loads(position.to_json()) == position.to_dict()
+
+
+def test_price_spread():
+    price = Price(bid=99.0, ask=100.0, date_time=datetime(2024, 1, 1))
+    assert price.spread() == (1.0, 0.01)
+    assert price.spread() is price.spread()
+
+
+def test_price_without_ask():
+    # Quoting a price must not fail, only asking for its spread (percentage) does
+    price = Price(bid=1.0, ask=0.0, date_time=datetime(2024, 1, 1))
+    with pytest.raises(ZeroDivisionError):
+        price.spread()
+
+
+def test_price_date_time_is_formatted_on_first_use():
+    price = Price(bid=99.0, ask=100.0, date_time="2024-01-01")
+    with pytest.raises(AttributeError):
+        price.to_dict()
+    price = Price(bid=99.0, ask=100.0, date_time=datetime(2024, 1, 1))
+    assert price.to_dict()["date_time"] == "2024-01-01T00:00:00"
+    assert price.to_dict()["date_time"] is price.to_dict()["date_time"]
@@ -1,7 +1,15 @@
 import indicatory.ranges_returns as rr
 import indicatory.names as names
 
-from polars import DataFrame
+from polars import DataFrame, LazyFrame
+
+HLC_TEST_DATAFRAME = DataFrame(
+    {
+        names.HIGH: [49.2, 49.35, 49.92, 50.19, 50.12],
+        names.LOW: [48.94, 48.86, 49.5, 49.87, 49.2],
+        names.CLOSE: [49.07, 49.32, 49.91, 50.13, 49.53],
+    }
+)
 
 
 def test_daily_returns():
@@ -34,28 +42,35 @@ def test_daily_range():
     )
 
 
-def test_true_ranges():
+def test_daily_returns_and_range():
     test_data = DataFrame(
         {
-            names.HIGH: [49.2, 49.35, 49.92, 50.19, 50.12],
-            names.LOW: [48.94, 48.86, 49.5, 49.87, 49.2],
-            names.CLOSE: [49.07, 49.32, 49.91, 50.13, 49.53],
+            names.OPEN: [2.0, 1.0, 1.0, 1.5, 4.0],
+            names.HIGH: [2.5, 1.0, 1.0, 1.5, 9.0],
+            names.LOW: [2.0, 1.0, 0.5, 0.5, 3.5],
+            names.CLOSE: [2.5, 1.0, 0.5, 1.0, 9.0],
         }
     )
+    result = rr.daily_returns_and_range(test_data)
+    assert result.equals(rr.daily_range(rr.daily_returns(test_data)))
+
+
+def test_true_ranges():
     expected_tr = (0.26, 0.49, 0.6, 0.32, 0.93)
-    result = rr.true_range(test_data)
+    result = rr.true_range(HLC_TEST_DATAFRAME)
     assert tuple(result[names.tr()]) == expected_tr
     assert "Previous Close" not in result.columns
 
 
 def test_average_true_range():
-    test_data = DataFrame(
-        {
-            names.HIGH: [49.2, 49.35, 49.92, 50.19, 50.12],
-            names.LOW: [48.94, 48.86, 49.5, 49.87, 49.2],
-            names.CLOSE: [49.07, 49.32, 49.91, 50.13, 49.53],
-        }
-    )
     expected_atr = (None, None, None, 0.45, 0.61)
-    result = rr.average_true_range(test_data, window_size=3)
+    result = rr.average_true_range(HLC_TEST_DATAFRAME, window_size=3)
     assert tuple(result[names.atr(3)]) == expected_atr
+
+
+def test_average_true_range_with_lazy_frame():
+    result = rr.average_true_range(HLC_TEST_DATAFRAME.lazy(), window_size=3)
+    assert isinstance(result, LazyFrame)
+    assert result.collect().equals(
+        rr.average_true_range(HLC_TEST_DATAFRAME, window_size=3)
+    )